@@ -17,6 +17,9 @@ class AFK(commands.Cog):
         self.bot = bot
         self.db = None
         self.write_lock = asyncio.Lock()
+        self.handler = None
+        # user_id -> (reason, since); mirrors the afk table
+        self.afk_users = {}
 
     async def cog_load(self):
         self.db = await aiosqlite.connect(DB_PATH)
@@ -31,14 +34,19 @@ class AFK(commands.Cog):
         """)
         await self.db.commit()
 
+        async with self.db.execute("SELECT user_id, reason, since FROM afk") as cursor:
+            for user_id, reason, since in await cursor.fetchall():
+                self.afk_users[user_id] = (reason, since)
+
+        self.handler = self.bot.router.register(
+            self.on_message, dms=True, check=self.is_relevant
+        )
+
     async def cog_unload(self):
+        self.bot.router.unregister(self.handler)
         if self.db:
             await self.db.close()
 
-    async def db_read(self, query, params=()):
-        async with self.db.execute(query, params) as cursor:
-            return await cursor.fetchone()
-
     async def db_write(self, query, params=()):
         async with self.write_lock:
             await self.db.execute(query, params)
@@ -60,10 +68,7 @@ class AFK(commands.Cog):
     @app_commands.describe(reason="Reason for being AFK")
     async def afk(self, ctx, *, reason: str = "AFK"):
 
-        existing = await self.db_read(
-            "SELECT reason, since FROM afk WHERE user_id = ?",
-            (ctx.author.id,)
-        )
+        existing = self.afk_users.get(ctx.author.id)
 
         # If already AFK
         if existing:
@@ -105,9 +110,11 @@ class AFK(commands.Cog):
             return
 
         # Not AFK yet â†’ set AFK
+        since = datetime.now(timezone.utc).isoformat()
+        self.afk_users[ctx.author.id] = (reason, since)
         await self.db_write(
             "INSERT INTO afk (user_id, reason, since) VALUES (?, ?, ?)",
-            (ctx.author.id, reason, datetime.now(timezone.utc).isoformat())
+            (ctx.author.id, reason, since)
         )
 
         view = discord.ui.LayoutView()
@@ -140,20 +147,20 @@ class AFK(commands.Cog):
                 allowed_mentions=discord.AllowedMentions.none()
             )
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot:
-            return
+    def is_relevant(self, parsed):
+        afk_users = self.afk_users
+        if not afk_users:
+            return False
+        return (
+            parsed.message.author.id in afk_users
+            or not afk_users.keys().isdisjoint(parsed.mention_ids)
+        )
 
-        ctx = await self.bot.get_context(message)
-        if ctx.valid:
-            return
+    async def on_message(self, parsed):
+        message: discord.Message = parsed.message
 
         # If author was AFK
-        row = await self.db_read(
-            "SELECT reason, since FROM afk WHERE user_id = ?",
-            (message.author.id,)
-        )
+        row = self.afk_users.pop(message.author.id, None)
 
         if row:
             await self.db_write(
@@ -192,10 +199,7 @@ class AFK(commands.Cog):
 
         # Check mentions
         for mention in message.mentions:
-            row = await self.db_read(
-                "SELECT reason, since FROM afk WHERE user_id = ?",
-                (mention.id,)
-            )
+            row = self.afk_users.get(mention.id)
 
             if row:
                 ago = self.format_ago(
@@ -1,6 +1,5 @@
 import discord
 from discord.ext import commands
-import aiohttp
 import asyncio
 
 
@@ -118,24 +117,24 @@ class CheckVanity(commands.Cog):
         code = code.strip().lower()
         url = f"https://discord.com/api/v10/invites/{code}?with_counts=true"
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, timeout=10) as resp:
+        session = self.bot.http_client
+        try:
+            async with session.get(url, timeout=10) as resp:
 
-                    if resp.status == 404:
-                        return await ctx.send(
-                            f"Vanity `{code}` is available."
-                        )
+                if resp.status == 404:
+                    return await ctx.send(
+                        f"Vanity `{code}` is available."
+                    )
 
-                    if resp.status != 200:
-                        return await ctx.send(
-                            f"API error: {resp.status}. Try again later."
-                        )
+                if resp.status != 200:
+                    return await ctx.send(
+                        f"API error: {resp.status}. Try again later."
+                    )
 
-                    data = await resp.json()
+                data = await resp.json()
 
-            except asyncio.TimeoutError:
-                return await ctx.send("Request timed out. Try again.")
+        except asyncio.TimeoutError:
+            return await ctx.send("Request timed out. Try again.")
 
         view = CheckVanityView(ctx.author, data, code)
 
@@ -1,6 +1,10 @@
 import io
+import os
 import asyncio
-from datetime import datetime, timezone
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import time
+import aiosqlite
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -8,23 +12,247 @@ import chess
 import chess.pgn
 import chess.svg
 import cairosvg
+from PIL import Image, ImageDraw
 import traceback
+import xml.etree.ElementTree as ET
+
+DB_PATH = "chess.db"
 
 INITIAL_TIME_MS = 600000
+# Games where fewer than two moves were made are aborted after this long
+# without a move.
+EARLY_ABORT_SECONDS = 120
 SVG_BOARD_SIZE = 700
-
-
-def render(board: chess.Board) -> discord.File:
+BOARD_COLORS = {"square light": "#f0d9b5", "square dark": "#b58863"}
+LASTMOVE_COLORS = {
+    True: chess.svg.DEFAULT_COLORS["square light lastmove"],
+    False: chess.svg.DEFAULT_COLORS["square dark lastmove"],
+}
+
+# "sprite" composites pre-rendered pieces with PIL; "svg" rasterizes the
+# whole board with cairosvg on every render.
+RENDER_BACKEND = "sprite"
+
+# Worker processes used for board rendering, and how many rendered PNGs
+# (keyed by position, last move and size) are kept in memory. Overridable
+# per deployment through CHESS_RENDER_WORKERS / CHESS_RENDER_CACHE_SIZE.
+RENDER_WORKERS = max(1, int(os.environ.get("CHESS_RENDER_WORKERS", 2)))
+RENDER_CACHE_SIZE = max(0, int(os.environ.get("CHESS_RENDER_CACHE_SIZE", 256)))
+
+# Passed to every chess.svg.board call. The sprite backend reads the board
+# geometry back from the viewBox these produce, so both backends agree.
+BOARD_SVG_ARGS = {"coordinates": True, "borders": False, "colors": BOARD_COLORS}
+
+
+def svg_png(fen: str, lastmove: str, size: int) -> bytes:
+    """Rasterize a position. Runs in a worker process."""
+    board = chess.Board(fen)
+    move = chess.Move.from_uci(lastmove) if lastmove else None
     svg = chess.svg.board(
         board,
-        size=SVG_BOARD_SIZE,
-        coordinates=True,
-        colors={"light": "#f0d9b5", "dark": "#b58863"}
+        size=size,
+        lastmove=move,
+        check=board.king(board.turn) if board.is_check() else None,
+        **BOARD_SVG_ARGS
     )
-    png = cairosvg.svg2png(bytestring=svg.encode())
-    buf = io.BytesIO(png)
-    buf.seek(0)
-    return discord.File(buf, filename="board.png")
+    return cairosvg.svg2png(bytestring=svg.encode())
+
+
+def board_geometry(svg: str):
+    """(offset, units) of a chess.svg board: the distance from the edge to
+    the a8 corner and the full width, both in viewBox units. Whatever sits
+    outside the squares (coordinate margin, borders) is split evenly."""
+    root = ET.fromstring(svg)
+    units = float(root.get("viewBox").split()[2])
+    return (units - 8 * chess.svg.SQUARE_SIZE) / 2, units
+
+
+class BoardSprites:
+    """Board background, piece sprites and check overlay at one size,
+    rasterized once with cairosvg and then reused for every position."""
+
+    def __init__(self, size: int):
+        self.size = size
+        background = chess.svg.board(None, size=size, **BOARD_SVG_ARGS)
+        offset, units = board_geometry(background)
+        scale = size / units
+        edges = [
+            round((offset + i * chess.svg.SQUARE_SIZE) * scale)
+            for i in range(9)
+        ]
+
+        # Pixel box of every square, white at the bottom.
+        self.boxes = []
+        for sq in chess.SQUARES:
+            f, r = chess.square_file(sq), chess.square_rank(sq)
+            self.boxes.append((edges[f], edges[7 - r], edges[f + 1], edges[8 - r]))
+
+        square_px = edges[1] - edges[0]
+
+        self.background = self.rasterize(background).convert("RGB")
+
+        self.pieces = {}
+        for color in chess.COLORS:
+            for piece_type in chess.PIECE_TYPES:
+                piece = chess.Piece(piece_type, color)
+                self.pieces[piece.symbol()] = self.rasterize(
+                    chess.svg.piece(piece, size=square_px)
+                )
+
+        su = chess.svg.SQUARE_SIZE
+        self.check = self.rasterize(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{square_px}" height="{square_px}" '
+            f'viewBox="0 0 {su} {su}"><defs>{chess.svg.CHECK_GRADIENT}</defs>'
+            f'<rect width="{su}" height="{su}" fill="url(#check_gradient)"/></svg>'
+        )
+
+    @staticmethod
+    def rasterize(svg: str) -> Image.Image:
+        png = cairosvg.svg2png(bytestring=svg.encode())
+        return Image.open(io.BytesIO(png)).convert("RGBA")
+
+    def compose(self, board: chess.Board, lastmove: chess.Move = None) -> Image.Image:
+        img = self.background.copy()
+
+        if lastmove:
+            draw = ImageDraw.Draw(img)
+            for sq in (lastmove.from_square, lastmove.to_square):
+                x0, y0, x1, y1 = self.boxes[sq]
+                light = bool(chess.BB_LIGHT_SQUARES & chess.BB_SQUARES[sq])
+                draw.rectangle((x0, y0, x1 - 1, y1 - 1), fill=LASTMOVE_COLORS[light])
+
+        if board.is_check():
+            king = board.king(board.turn)
+            if king is not None:
+                x0, y0, _, _ = self.boxes[king]
+                img.paste(self.check, (x0, y0), self.check)
+
+        for sq, piece in board.piece_map().items():
+            sprite = self.pieces[piece.symbol()]
+            x0, y0, _, _ = self.boxes[sq]
+            img.paste(sprite, (x0, y0), sprite)
+
+        return img
+
+
+_sprites = {}
+
+
+def get_sprites(size: int) -> BoardSprites:
+    sprites = _sprites.get(size)
+    if sprites is None:
+        sprites = _sprites[size] = BoardSprites(size)
+    return sprites
+
+
+def init_worker(backend: str, size: int):
+    """Pool initializer: each worker builds its own sprite set up front, so
+    nothing depends on state inherited from the parent process."""
+    if backend == "sprite":
+        get_sprites(size)
+
+
+def sprite_png(fen: str, lastmove: str, size: int) -> bytes:
+    """Composite a position from cached sprites. Runs in a worker process."""
+    board = chess.Board(fen)
+    move = chess.Move.from_uci(lastmove) if lastmove else None
+    img = get_sprites(size).compose(board, move)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+RENDER_BACKENDS = {"svg": svg_png, "sprite": sprite_png}
+
+
+class BoardRenderer:
+    def __init__(
+        self,
+        backend: str = RENDER_BACKEND,
+        workers: int = RENDER_WORKERS,
+        cache_size: int = RENDER_CACHE_SIZE,
+        size: int = SVG_BOARD_SIZE
+    ):
+        self.backend = backend
+        self.render_fn = RENDER_BACKENDS[backend]
+        self.workers = workers
+        self.cache_size = cache_size
+        self.size = size
+        self.pool = None
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached": len(self.cache),
+            "workers": self.workers,
+            "backend": self.backend,
+        }
+
+    def start(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=init_worker,
+                initargs=(self.backend, self.size)
+            )
+
+    async def warm(self):
+        """Render the starting position, which every new game shows first.
+        Brings up a worker (and its sprites) before the first real move."""
+        await self.render_bytes(chess.Board())
+
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    async def render_bytes(self, board: chess.Board) -> bytes:
+        lastmove = board.peek().uci() if board.move_stack else ""
+        key = (board.fen(), lastmove, self.size)
+
+        png = self.cache.get(key)
+        if png is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return png
+
+        # Identical renders already in flight share one job.
+        fut = self.pending.get(key)
+        if fut is not None:
+            self.hits += 1
+            return await asyncio.shield(fut)
+
+        self.misses += 1
+        self.start()
+
+        loop = asyncio.get_running_loop()
+        fut = loop.run_in_executor(self.pool, self.render_fn, key[0], lastmove, self.size)
+        self.pending[key] = fut
+        try:
+            png = await asyncio.shield(fut)
+        finally:
+            self.pending.pop(key, None)
+
+        self.cache[key] = png
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return png
+
+    async def render(self, board: chess.Board) -> discord.File:
+        png = await self.render_bytes(board)
+        return discord.File(io.BytesIO(png), filename="board.png")
+
+
+renderer = BoardRenderer()
+
+
+async def render(board: chess.Board) -> discord.File:
+    return await renderer.render(board)
 
 
 def ms_to_str(ms: int) -> str:
@@ -33,17 +261,171 @@ def ms_to_str(ms: int) -> str:
     return f"{s//60:02d}:{s%60:02d}"
 
 
+class ChessGame:
+    """Compact state of one running game, keyed by its board message id.
+
+    Only the UCI move list is kept; the chess.Board (and the PGN) are
+    rebuilt from it when a button needs them.
+    """
+
+    __slots__ = (
+        "gid", "channel_id", "w", "b", "white_name", "black_name", "moves",
+        "moves_made", "white_t", "black_t", "last", "last_action",
+        "early_abort_enabled", "draw_offer",
+    )
+
+    def __init__(self, gid, channel_id, w, b, white_name, black_name, moves="",
+                 white_t=INITIAL_TIME_MS, black_t=INITIAL_TIME_MS, last=None,
+                 last_action=None, early_abort_enabled=True, draw_offer=None):
+        now = time.time()
+        self.gid = gid
+        self.channel_id = channel_id
+        self.w = w
+        self.b = b
+        self.white_name = white_name
+        self.black_name = black_name
+        # space-terminated UCI moves, so appending never needs a separator check
+        self.moves = moves
+        self.moves_made = moves.count(" ")
+        self.white_t = white_t
+        self.black_t = black_t
+        self.last = now if last is None else last
+        self.last_action = now if last_action is None else last_action
+        self.early_abort_enabled = early_abort_enabled
+        self.draw_offer = draw_offer
+
+    def board(self) -> chess.Board:
+        # stored moves were validated when they were made, so replay them
+        # without push_uci's per-move legality check
+        board = chess.Board()
+        for uci in self.moves.split():
+            board.push(chess.Move.from_uci(uci))
+        return board
+
+    def push(self, move: chess.Move):
+        self.moves += move.uci() + " "
+        self.moves_made += 1
+        if self.moves_made >= 2:
+            self.early_abort_enabled = False
+
+    def pgn(self) -> chess.pgn.Game:
+        game = chess.pgn.Game.from_board(self.board())
+        game.headers["White"] = self.white_name
+        game.headers["Black"] = self.black_name
+        return game
+
+    def player_to_move(self, board: chess.Board) -> int:
+        return self.w if board.turn else self.b
+
+    def charge_clock(self, board: chess.Board):
+        now = time.time()
+        elapsed = int((now - self.last) * 1000)
+        if board.turn == chess.WHITE:
+            self.white_t = max(0, self.white_t - elapsed)
+        else:
+            self.black_t = max(0, self.black_t - elapsed)
+        self.last = now
+        self.last_action = now
+
+    def clock_text(self) -> str:
+        return f"White {ms_to_str(self.white_t)} | Black {ms_to_str(self.black_t)}"
+
+
+class ChessStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.db = None
+        self.write_lock = asyncio.Lock()
+
+    async def open(self):
+        self.db = await aiosqlite.connect(self.path)
+        await self.db.execute("PRAGMA journal_mode=WAL;")
+        await self.db.execute("PRAGMA busy_timeout = 5000;")
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS chess_games (
+                gid INTEGER PRIMARY KEY,
+                channel_id INTEGER,
+                white_id INTEGER,
+                black_id INTEGER,
+                white_name TEXT,
+                black_name TEXT,
+                moves TEXT,
+                white_t INTEGER,
+                black_t INTEGER,
+                last REAL,
+                last_action REAL,
+                early_abort INTEGER,
+                draw_offer INTEGER
+            )
+        """)
+        await self.db.commit()
+
+    async def close(self):
+        if self.db:
+            await self.db.close()
+            self.db = None
+
+    async def write(self, query, params=()):
+        async with self.write_lock:
+            await self.db.execute(query, params)
+            await self.db.commit()
+
+    async def create(self, game: ChessGame):
+        await self.write(
+            "INSERT OR REPLACE INTO chess_games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                game.gid, game.channel_id, game.w, game.b, game.white_name,
+                game.black_name, game.moves, game.white_t, game.black_t,
+                game.last, game.last_action, int(game.early_abort_enabled),
+                game.draw_offer,
+            )
+        )
+
+    async def update(self, game: ChessGame, move: chess.Move = None):
+        """Persist clocks and flags, appending `move` to the stored list."""
+        await self.write(
+            "UPDATE chess_games SET moves = moves || ?, white_t=?, black_t=?, last=?, "
+            "last_action=?, early_abort=?, draw_offer=? WHERE gid=?",
+            (
+                move.uci() + " " if move else "",
+                game.white_t, game.black_t, game.last, game.last_action,
+                int(game.early_abort_enabled), game.draw_offer, game.gid,
+            )
+        )
+
+    async def delete(self, gid: int):
+        await self.write("DELETE FROM chess_games WHERE gid=?", (gid,))
+
+    async def load_all(self) -> list:
+        async with self.db.execute("SELECT * FROM chess_games") as cursor:
+            rows = await cursor.fetchall()
+
+        return [
+            ChessGame(
+                gid, channel_id, w, b, white_name, black_name, moves,
+                white_t, black_t, last, last_action, bool(early_abort), draw_offer
+            )
+            for (gid, channel_id, w, b, white_name, black_name, moves,
+                 white_t, black_t, last, last_action, early_abort, draw_offer) in rows
+        ]
+
+
 async def safe_end_game(manager, game, reason, winner_id=None, loser_id=None):
+    if manager.games.get(game.gid) is not game:
+        return
+    manager.cleanup(game.gid)
+
     files = []
+    board = game.board()
     try:
         buf = io.StringIO()
-        game["pgn_game"].accept(chess.pgn.FileExporter(buf))
+        game.pgn().accept(chess.pgn.FileExporter(buf))
         files.append(discord.File(io.BytesIO(buf.getvalue().encode()), filename="game.pgn"))
     except Exception:
         pass
 
     try:
-        files.append(render(game["board"]))
+        files.append(await render(board))
     except Exception:
         pass
 
@@ -52,14 +434,10 @@ async def safe_end_game(manager, game, reason, winner_id=None, loser_id=None):
     else:
         text = f"Game Over — Draw ({reason})"
 
-    chan = manager.bot.get_channel(game["channel_id"])
+    chan = manager.bot.get_channel(game.channel_id)
     if chan:
         try:
-            starter = await chan.fetch_message(game["starter_msg_id"])
-            try:
-                await starter.edit(content=text, view=None, attachments=[])
-            except Exception:
-                pass
+            await chan.get_partial_message(game.gid).edit(content=text, view=None, attachments=[])
         except Exception:
             pass
 
@@ -68,7 +446,22 @@ async def safe_end_game(manager, game, reason, winner_id=None, loser_id=None):
         except Exception:
             pass
 
-    manager.cleanup(game["starter_msg_id"])
+
+async def finish_if_over(manager, game, board, interaction) -> bool:
+    if not board.is_game_over(claim_draw=True):
+        return False
+
+    r = board.result(claim_draw=True)
+    if r == "1-0":
+        await safe_end_game(manager, game, "Checkmate", game.w, game.b)
+        await interaction.response.send_message("Checkmate.", ephemeral=True)
+    elif r == "0-1":
+        await safe_end_game(manager, game, "Checkmate", game.b, game.w)
+        await interaction.response.send_message("Checkmate.", ephemeral=True)
+    else:
+        await safe_end_game(manager, game, "Draw")
+        await interaction.response.send_message("Draw.", ephemeral=True)
+    return True
 
 
 class ChessManager:
@@ -76,6 +469,10 @@ class ChessManager:
         self.bot = bot
         self.games = {}
         self.active = set()
+        self.renderer = renderer
+        self.store = ChessStore(DB_PATH)
+        # gid -> TimerHandle firing at the side to move's deadline
+        self.timers = {}
 
     async def start(self, interaction: discord.Interaction, challenger: discord.Member, opponent: discord.Member):
         if opponent.bot:
@@ -92,11 +489,88 @@ class ChessManager:
         except Exception:
             view.msg = None
 
-    def cleanup(self, starter_msg_id):
-        g = self.games.pop(starter_msg_id, None)
+    async def restore(self):
+        """Reload running games after a restart and re-attach their boards.
+
+        Clocks resume from now: the side to move isn't charged for the time
+        the bot was offline.
+        """
+        for game in await self.store.load_all():
+            game.last = game.last_action = time.time()
+            self.games[game.gid] = game
+            self.active.add(game.w)
+            self.active.add(game.b)
+
+            board = game.board()
+            view = BoardView(game, self, board)
+            self.bot.add_view(view, message_id=game.gid)
+            self.schedule(game, board)
+
+            chan = self.bot.get_channel(game.channel_id)
+            if not chan:
+                continue
+            try:
+                await chan.get_partial_message(game.gid).edit(
+                    content=(f"<@{game.player_to_move(board)}> to move\n"
+                             f"{game.clock_text()}"),
+                    view=view
+                )
+            except Exception:
+                pass
+
+    def schedule(self, game, board=None):
+        """(Re)arm the game's single deadline: the side to move flagging, or
+        the early-abort window closing, whichever comes first."""
+        old = self.timers.pop(game.gid, None)
+        if old:
+            old.cancel()
+
+        board = board or game.board()
+        remaining = game.white_t if board.turn == chess.WHITE else game.black_t
+        deadline = game.last + remaining / 1000
+        reason = "Timeout"
+
+        if game.early_abort_enabled:
+            abort_at = game.last_action + EARLY_ABORT_SECONDS
+            if abort_at <= deadline:
+                deadline = abort_at
+                reason = "Inactivity"
+
+        delay = max(0.0, deadline - time.time())
+        loop = asyncio.get_running_loop()
+        self.timers[game.gid] = loop.call_later(delay, self._expire, game.gid, reason)
+
+    def _expire(self, gid, reason):
+        self.timers.pop(gid, None)
+        game = self.games.get(gid)
+        if game is None:
+            return
+        asyncio.get_running_loop().create_task(self.expire(game, reason))
+
+    async def expire(self, game, reason):
+        try:
+            if reason == "Inactivity":
+                return await safe_end_game(self, game, "Inactivity")
+
+            if game.board().turn == chess.WHITE:
+                game.white_t = 0
+                winner, loser = game.b, game.w
+            else:
+                game.black_t = 0
+                winner, loser = game.w, game.b
+            await safe_end_game(self, game, "Timeout", winner, loser)
+        except Exception:
+            traceback.print_exc()
+
+    def cleanup(self, gid):
+        timer = self.timers.pop(gid, None)
+        if timer:
+            timer.cancel()
+        g = self.games.pop(gid, None)
         if g:
-            self.active.discard(g.get("w"))
-            self.active.discard(g.get("b"))
+            self.active.discard(g.w)
+            self.active.discard(g.b)
+            asyncio.get_running_loop().create_task(self.store.delete(gid))
 
 
 class ChallengeView(discord.ui.View):
@@ -124,42 +598,25 @@ class ChallengeView(discord.ui.View):
         self.manager.active.add(self.o.id)
 
         board = chess.Board()
-        pgn = chess.pgn.Game()
-        pgn.headers["White"] = self.c.name
-        pgn.headers["Black"] = self.o.name
-        now = datetime.now(timezone.utc)
-
-        game = {
-            "board": board,
-            "w": self.c.id,
-            "b": self.o.id,
-            "pgn_game": pgn,
-            "pgn_node": pgn,
-            "channel_id": interaction.channel_id,
-            "starter_msg_id": None,
-            "white_t": INITIAL_TIME_MS,
-            "black_t": INITIAL_TIME_MS,
-            "last": now,
-            "last_action": now,
-            "moves_made": 0,
-            "early_abort_enabled": True,
-            "draw_offer": None
-        }
 
         await interaction.response.defer()
 
         try:
-            file = render(board)
-            view = BoardView(game, self.manager, None)
+            file = await render(board)
+            game = ChessGame(None, interaction.channel_id, self.c.id, self.o.id, self.c.name, self.o.name)
+            view = BoardView(game, self.manager, board)
             starter = await interaction.followup.send(
                 content=(f"Game start — White: {self.c.mention}\n"
-                         f"White {ms_to_str(game['white_t'])} | Black {ms_to_str(game['black_t'])}"),
+                         f"{game.clock_text()}"),
                 file=file,
                 view=view
             )
-            game["starter_msg_id"] = starter.id
-            view.starter_id = starter.id
+            game.gid = starter.id
+            # the clock starts once the board is actually up
+            game.last = game.last_action = time.time()
             self.manager.games[starter.id] = game
+            await self.manager.store.create(game)
+            self.manager.schedule(game, board)
         except Exception as e:
             try:
                 await interaction.followup.send(f"Failed to start: `{e}`", ephemeral=True)
@@ -177,19 +634,20 @@ class ChallengeView(discord.ui.View):
 
 class DrawBtn(discord.ui.Button):
     def __init__(self, game, manager):
-        super().__init__(label="Draw", style=discord.ButtonStyle.secondary)
+        super().__init__(label="Draw", style=discord.ButtonStyle.secondary, custom_id="chess:draw")
         self.game = game
         self.manager = manager
 
     async def callback(self, interaction: discord.Interaction):
         try:
             u = interaction.user.id
-            if u not in (self.game["w"], self.game["b"]):
+            if u not in (self.game.w, self.game.b):
                 return await interaction.response.send_message("Not your game.", ephemeral=True)
-            offered = self.game.get("draw_offer")
-            opp = self.game["b"] if u == self.game["w"] else self.game["w"]
+            offered = self.game.draw_offer
+            opp = self.game.b if u == self.game.w else self.game.w
             if offered is None:
-                self.game["draw_offer"] = u
+                self.game.draw_offer = u
+                await self.manager.store.update(self.game)
                 return await interaction.response.send_message(f"Draw offered to <@{opp}>.", ephemeral=True)
             if offered == u:
                 return await interaction.response.send_message("Already offered.", ephemeral=True)
@@ -202,16 +660,16 @@ class DrawBtn(discord.ui.Button):
 
 class ResignBtn(discord.ui.Button):
     def __init__(self, game, manager):
-        super().__init__(label="Resign", style=discord.ButtonStyle.red)
+        super().__init__(label="Resign", style=discord.ButtonStyle.red, custom_id="chess:resign")
         self.game = game
         self.manager = manager
 
     async def callback(self, interaction: discord.Interaction):
         try:
             u = interaction.user.id
-            if u not in (self.game["w"], self.game["b"]):
+            if u not in (self.game.w, self.game.b):
                 return await interaction.response.send_message("Not your game.", ephemeral=True)
-            winner = self.game["b"] if u == self.game["w"] else self.game["w"]
+            winner = self.game.b if u == self.game.w else self.game.w
             await safe_end_game(self.manager, self.game, "Resigned", winner, u)
             return await interaction.response.send_message("You resigned.", ephemeral=True)
         except Exception:
@@ -221,13 +679,13 @@ class ResignBtn(discord.ui.Button):
 
 class TimeBtn(discord.ui.Button):
     def __init__(self, game):
-        super().__init__(label="Time", style=discord.ButtonStyle.secondary)
+        super().__init__(label="Time", style=discord.ButtonStyle.secondary, custom_id="chess:time")
         self.game = game
 
     async def callback(self, interaction: discord.Interaction):
         try:
             return await interaction.response.send_message(
-                f"White {ms_to_str(self.game['white_t'])}\nBlack {ms_to_str(self.game['black_t'])}",
+                f"White {ms_to_str(self.game.white_t)}\nBlack {ms_to_str(self.game.black_t)}",
                 ephemeral=True
             )
         except Exception:
@@ -237,16 +695,16 @@ class TimeBtn(discord.ui.Button):
 
 class PieceBtn(discord.ui.Button):
     def __init__(self, sq, game, manager):
-        super().__init__(label=chess.square_name(sq), style=discord.ButtonStyle.blurple)
+        name = chess.square_name(sq)
+        super().__init__(label=name, style=discord.ButtonStyle.blurple, custom_id=f"chess:piece:{name}")
         self.sq = sq
         self.game = game
         self.manager = manager
 
     async def callback(self, interaction: discord.Interaction):
         try:
-            b = self.game["board"]
-            expected = self.game["w"] if b.turn else self.game["b"]
-            if interaction.user.id != expected:
+            b = self.game.board()
+            if interaction.user.id != self.game.player_to_move(b):
                 return await interaction.response.send_message("Not your turn.", ephemeral=True)
 
             moves = [m for m in b.legal_moves if m.from_square == self.sq]
@@ -255,7 +713,7 @@ class PieceBtn(discord.ui.Button):
 
             await interaction.response.edit_message(
                 content=f"Moves from {self.label}",
-                view=MoveView(self.game, moves, self.manager, self.game["starter_msg_id"])
+                view=MoveView(self.game, moves, self.manager)
             )
         except Exception:
             traceback.print_exc()
@@ -270,63 +728,43 @@ class MoveBtn(discord.ui.Button):
         lbl = chess.square_name(move.to_square)
         if move.promotion:
             lbl += "=" + chess.piece_symbol(move.promotion).upper()
-        super().__init__(label=lbl, style=discord.ButtonStyle.green)
+        super().__init__(label=lbl, style=discord.ButtonStyle.green, custom_id=f"chess:move:{move.uci()}")
         self.game = game
         self.move = move
         self.manager = manager
 
     async def callback(self, interaction: discord.Interaction):
         try:
-            b = self.game["board"]
-            expected = self.game["w"] if b.turn else self.game["b"]
-            if interaction.user.id != expected:
+            b = self.game.board()
+            if interaction.user.id != self.game.player_to_move(b):
                 return await interaction.response.send_message("Not your turn.", ephemeral=True)
 
-            now = datetime.now(timezone.utc)
-            elapsed = int((now - self.game["last"]).total_seconds() * 1000)
-            if b.turn == chess.WHITE:
-                self.game["white_t"] = max(0, self.game["white_t"] - elapsed)
-            else:
-                self.game["black_t"] = max(0, self.game["black_t"] - elapsed)
-            self.game["last"] = now
-            self.game["last_action"] = now
+            self.game.charge_clock(b)
 
-            if self.game["white_t"] <= 0 or self.game["black_t"] <= 0:
-                winner = self.game["b"] if self.game["white_t"] <= 0 else self.game["w"]
-                loser = self.game["w"] if winner == self.game["b"] else self.game["b"]
+            if self.game.white_t <= 0 or self.game.black_t <= 0:
+                winner = self.game.b if self.game.white_t <= 0 else self.game.w
+                loser = self.game.w if winner == self.game.b else self.game.b
                 await safe_end_game(self.manager, self.game, "Timeout", winner, loser)
                 return await interaction.response.send_message("Timeout.", ephemeral=True)
 
             piece = b.piece_at(self.move.from_square)
             rank = chess.square_rank(self.move.to_square)
             if piece and piece.piece_type == chess.PAWN and rank in (0, 7) and not self.move.promotion:
+                await self.manager.store.update(self.game)
                 return await interaction.response.edit_message(
                     content="Choose promotion piece:",
                     view=PromotionView(self.game, self.move, self.manager)
                 )
 
             b.push(self.move)
-            try:
-                self.game["pgn_node"] = self.game["pgn_node"].add_main_variation(self.move)
-            except Exception:
-                pass
+            self.game.push(self.move)
 
-            self.game["moves_made"] += 1
-            if self.game["moves_made"] >= 2:
-                self.game["early_abort_enabled"] = False
+            if await finish_if_over(self.manager, self.game, b, interaction):
+                return
 
-            if b.is_game_over(claim_draw=True):
-                r = b.result(claim_draw=True)
-                if r == "1-0":
-                    await safe_end_game(self.manager, self.game, "Checkmate", self.game["w"], self.game["b"])
-                    return await interaction.response.send_message("Checkmate.", ephemeral=True)
-                if r == "0-1":
-                    await safe_end_game(self.manager, self.game, "Checkmate", self.game["b"], self.game["w"])
-                    return await interaction.response.send_message("Checkmate.", ephemeral=True)
-                await safe_end_game(self.manager, self.game, "Draw")
-                return await interaction.response.send_message("Draw.", ephemeral=True)
-
-            next_player = self.game["w"] if b.turn else self.game["b"]
+            await self.manager.store.update(self.game, self.move)
+            self.manager.schedule(self.game, b)
+            next_player = self.game.player_to_move(b)
 
             try:
                 try:
@@ -336,9 +774,9 @@ class MoveBtn(discord.ui.Button):
 
                 await interaction.response.edit_message(
                     content=(f"<@{next_player}> to move\n"
-                             f"White {ms_to_str(self.game['white_t'])} | Black {ms_to_str(self.game['black_t'])}"),
-                    attachments=[render(b)],
-                    view=BoardView(self.game, self.manager, self.game["starter_msg_id"])
+                             f"{self.game.clock_text()}"),
+                    attachments=[await render(b)],
+                    view=BoardView(self.game, self.manager, b)
                 )
             except Exception:
                 traceback.print_exc()
@@ -357,7 +795,8 @@ class MoveBtn(discord.ui.Button):
 
 class PromoBtn(discord.ui.Button):
     def __init__(self, pt, label, style, game, base_move, manager):
-        super().__init__(label=label, style=style)
+        mv = chess.Move(base_move.from_square, base_move.to_square, promotion=pt)
+        super().__init__(label=label, style=style, custom_id=f"chess:promo:{mv.uci()}")
         self.pt = pt
         self.game = game
         self.base_move = base_move
@@ -365,43 +804,22 @@ class PromoBtn(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         try:
-            b = self.game["board"]
-            expected = self.game["w"] if b.turn else self.game["b"]
-            if interaction.user.id != expected:
+            b = self.game.board()
+            if interaction.user.id != self.game.player_to_move(b):
                 return await interaction.response.send_message("Not your turn.", ephemeral=True)
 
-            now = datetime.now(timezone.utc)
-            elapsed = int((now - self.game["last"]).total_seconds() * 1000)
-            if b.turn == chess.WHITE:
-                self.game["white_t"] = max(0, self.game["white_t"] - elapsed)
-            else:
-                self.game["black_t"] = max(0, self.game["black_t"] - elapsed)
-            self.game["last"] = now
-            self.game["last_action"] = now
+            self.game.charge_clock(b)
 
             mv = chess.Move(self.base_move.from_square, self.base_move.to_square, promotion=self.pt)
             b.push(mv)
-            try:
-                self.game["pgn_node"] = self.game["pgn_node"].add_main_variation(mv)
-            except Exception:
-                pass
+            self.game.push(mv)
 
-            self.game["moves_made"] += 1
-            if self.game["moves_made"] >= 2:
-                self.game["early_abort_enabled"] = False
+            if await finish_if_over(self.manager, self.game, b, interaction):
+                return
 
-            if b.is_game_over(claim_draw=True):
-                r = b.result(claim_draw=True)
-                if r == "1-0":
-                    await safe_end_game(self.manager, self.game, "Checkmate", self.game["w"], self.game["b"])
-                    return await interaction.response.send_message("Checkmate.", ephemeral=True)
-                if r == "0-1":
-                    await safe_end_game(self.manager, self.game, "Checkmate", self.game["b"], self.game["w"])
-                    return await interaction.response.send_message("Checkmate.", ephemeral=True)
-                await safe_end_game(self.manager, self.game, "Draw")
-                return await interaction.response.send_message("Draw.", ephemeral=True)
-
-            next_player = self.game["w"] if b.turn else self.game["b"]
+            await self.manager.store.update(self.game, mv)
+            self.manager.schedule(self.game, b)
+            next_player = self.game.player_to_move(b)
 
             try:
                 try:
@@ -411,9 +829,9 @@ class PromoBtn(discord.ui.Button):
 
                 await interaction.response.edit_message(
                     content=(f"<@{next_player}> to move\n"
-                             f"White {ms_to_str(self.game['white_t'])} | Black {ms_to_str(self.game['black_t'])}"),
-                    attachments=[render(b)],
-                    view=BoardView(self.game, self.manager, self.game["starter_msg_id"])
+                             f"{self.game.clock_text()}"),
+                    attachments=[await render(b)],
+                    view=BoardView(self.game, self.manager, b)
                 )
             except Exception:
                 traceback.print_exc()
@@ -431,11 +849,10 @@ class PromoBtn(discord.ui.Button):
 
 
 class MoveView(discord.ui.View):
-    def __init__(self, game, moves, manager, starter_id):
+    def __init__(self, game, moves, manager):
         super().__init__(timeout=None)
         self.game = game
         self.manager = manager
-        self.starter_id = starter_id
         for m in moves:
             self.add_item(MoveBtn(game, m, manager))
         self.add_item(DrawBtn(game, manager))
@@ -444,13 +861,12 @@ class MoveView(discord.ui.View):
 
 
 class BoardView(discord.ui.View):
-    def __init__(self, game, manager, starter_id):
+    def __init__(self, game, manager, board=None):
         super().__init__(timeout=None)
         self.game = game
         self.manager = manager
-        self.starter_id = starter_id
 
-        b = game["board"]
+        b = board or game.board()
         legal_from = sorted({m.from_square for m in b.legal_moves})
         count = 0
         for sq in legal_from:
@@ -483,19 +899,29 @@ class ChessCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.bot.manager = ChessManager(bot)
-        bot.loop.create_task(self.inactivity_check())
 
-    async def inactivity_check(self):
+    async def cog_load(self):
+        renderer.start()
+        try:
+            await renderer.warm()
+        except Exception:
+            traceback.print_exc()
+        await self.bot.manager.store.open()
+        self.bot.loop.create_task(self.restore_games())
+
+    async def cog_unload(self):
+        for timer in self.bot.manager.timers.values():
+            timer.cancel()
+        self.bot.manager.timers.clear()
+        await self.bot.manager.store.close()
+        renderer.shutdown()
+
+    async def restore_games(self):
         await self.bot.wait_until_ready()
-        while True:
-            now = datetime.now(timezone.utc)
-            for msgid, g in list(self.bot.manager.games.items()):
-                try:
-                    if g.get("early_abort_enabled") and (now - g.get("last_action", now)).total_seconds() > 120:
-                        await safe_end_game(self.bot.manager, g, "Inactivity")
-                except Exception:
-                    traceback.print_exc()
-            await asyncio.sleep(10)
+        try:
+            await self.bot.manager.restore()
+        except Exception:
+            traceback.print_exc()
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -22,22 +22,35 @@ class Counting(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.data = load_data()
+        self.channels = {g["channel"] for g in self.data.values()}
+        self.handler = None
+
+    async def cog_load(self):
+        self.handler = self.bot.router.register(
+            self.on_message, channels=self.channels, commands=True
+        )
+
+    async def cog_unload(self):
+        self.bot.router.unregister(self.handler)
 
     @commands.command()
     @commands.has_permissions(manage_guild=True)
     async def counting(self, ctx, channel: discord.TextChannel):
+        previous = self.data.get(str(ctx.guild.id))
+        if previous:
+            self.channels.discard(previous["channel"])
+
         self.data[str(ctx.guild.id)] = {
             "channel": channel.id,
             "last_number": 0,
             "last_user": None
         }
+        self.channels.add(channel.id)
         save_data(self.data)
         await ctx.send(f"Counting channel set to {channel.mention}")
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot or not message.guild:
-            return
+    async def on_message(self, parsed):
+        message = parsed.message
 
         guild_id = str(message.guild.id)
         if guild_id not in self.data:
@@ -1,6 +1,5 @@
 import discord
 from discord.ext import commands
-import aiohttp
 
 class Define(commands.Cog):
     def __init__(self, bot):
@@ -13,11 +12,11 @@ class Define(commands.Cog):
 
         url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word.lower()}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return await ctx.reply(f"No definition found for `{word}`.", mention_author=False)
-                data = await response.json()
+        session = self.bot.http_client
+        async with session.get(url) as response:
+            if response.status != 200:
+                return await ctx.reply(f"No definition found for `{word}`.", mention_author=False)
+            data = await response.json()
 
         try:
             meaning_data = data[0]["meanings"][0]
@@ -1,8 +1,22 @@
 import discord
-from discord.ext import commands
-import aiohttp
+from discord.ext import commands, tasks
+import asyncio
+import json
+import os
 import random
 import time
+from collections import deque
+from utils.prefetch import PrefetchBuffer
+
+SEEN_FILE = "furina_seen.json"
+
+# safebooru hands back up to 100 posts per page; refetch in the background
+# once fewer than BUFFER_SIZE remain, and skip any of the last SEEN_POSTS
+# post ids shown (the window survives restarts via SEEN_FILE)
+BUFFER_SIZE = 20
+SEEN_POSTS = 1000
+# recently served posts, reused if the buffer ever runs dry mid-refresh
+STALE_POSTS = 50
 
 
 class FurinaView(discord.ui.LayoutView):
@@ -64,7 +78,7 @@ class FurinaView(discord.ui.LayoutView):
 
         self.cooldowns[interaction.user.id] = now
 
-        post = await self.cog.get_image()
+        post = self.cog.next_image()
         if not post:
             return await interaction.response.send_message(
                 "No images available.",
@@ -82,8 +96,57 @@ class FurinaView(discord.ui.LayoutView):
 class Furina(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.cache = []
-        self.last_fetch = 0
+        self.buffer = PrefetchBuffer(
+            self.fetch_batch,
+            key=lambda p: p.get("id") or p["file_url"],
+            size=BUFFER_SIZE,
+            recent=SEEN_POSTS
+        )
+        self.stale = deque(maxlen=STALE_POSTS)
+        self.seen_dirty = False
+
+    async def cog_load(self):
+        self.buffer.mark_seen(await asyncio.to_thread(self.load_seen))
+        self.buffer.warm()
+        self.save_seen_loop.start()
+
+    async def cog_unload(self):
+        self.save_seen_loop.cancel()
+        self.buffer.close()
+        if self.seen_dirty:
+            await self.save_seen()
+
+    # -------------------------
+    # Seen window
+    # -------------------------
+
+    def load_seen(self):
+        if not os.path.exists(SEEN_FILE):
+            return []
+        try:
+            with open(SEEN_FILE, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def write_seen(self, seen):
+        tmp = SEEN_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(seen, f)
+        os.replace(tmp, SEEN_FILE)
+
+    async def save_seen(self):
+        self.seen_dirty = False
+        await asyncio.to_thread(self.write_seen, self.buffer.seen())
+
+    @tasks.loop(minutes=5)
+    async def save_seen_loop(self):
+        if self.seen_dirty:
+            await self.save_seen()
+
+    # -------------------------
+    # Safebooru
+    # -------------------------
 
     async def fetch_posts(self):
         url = "https://safebooru.org/index.php"
@@ -98,47 +161,51 @@ class Furina(commands.Cog):
             "tags": "furina_(genshin_impact)"
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as resp:
-                if resp.status != 200:
-                    print("Safebooru error:", resp.status)
-                    return None
-
-                try:
-                    return await resp.json(content_type=None)
-                except:
-                    return None
-
-    async def refresh_cache(self):
-        for _ in range(5):
-            data = await self.fetch_posts()
-            if not data:
-                continue
-
-            clean = [
-                p for p in data
-                if p.get("file_url")
-                and p["file_url"].startswith("http")
-            ]
-
-            if clean:
-                random.shuffle(clean)
-                self.cache = clean
-                self.last_fetch = time.time()
-                return True
-
-        return False
-
-    async def get_image(self):
-        if not self.cache or time.time() - self.last_fetch > 600:
-            success = await self.refresh_cache()
-            if not success:
+        session = self.bot.http_client
+        async with session.get(url, params=params) as resp:
+            if resp.status != 200:
+                print("Safebooru error:", resp.status)
+                return None
+
+            try:
+                return await resp.json(content_type=None)
+            except:
                 return None
 
-        if not self.cache:
+    async def fetch_batch(self):
+        data = await self.fetch_posts()
+        if not data:
             return None
 
-        return self.cache.pop()
+        clean = [
+            p for p in data
+            if p.get("file_url")
+            and p["file_url"].startswith("http")
+        ]
+
+        random.shuffle(clean)
+        return clean
+
+    def served(self, post):
+        self.stale.append(post)
+        self.seen_dirty = True
+        return post
+
+    def next_image(self):
+        """Never waits: a fresh post if one is buffered, otherwise a
+        recently served one while the background refill catches up."""
+        post = self.buffer.get_nowait()
+        if post:
+            return self.served(post)
+        if self.stale:
+            return random.choice(self.stale)
+        return None
+
+    async def get_image(self, timeout: float = 10):
+        post = await self.buffer.get(timeout)
+        if post:
+            return self.served(post)
+        return self.next_image()
 
     @commands.command()
     async def furina(self, ctx):
@@ -1,9 +1,11 @@
 import discord
-from discord.ext import commands, tasks
-import sqlite3
+from discord.ext import commands
+import aiosqlite
+import asyncio
+import heapq
 import random
+import time
 from datetime import datetime, timedelta
-import re
 
 DB_PATH = "giveaways.db"
 
@@ -11,6 +13,9 @@ ENTRY_EMOJI = "<a:Furina_play:1475973589617606847>"
 GIVEAWAY_EMOJI = "<:giveaway:1476099137844936877>"
 DOT = "<:BlueDot:1477069909296025762>"
 
+# Minimum time between two edits of the same giveaway's entry count.
+FLUSH_INTERVAL = 10
+
 
 def parse_duration(value: str) -> int:
     value = value.lower().strip()
@@ -27,40 +32,192 @@ def parse_duration(value: str) -> int:
     return amount * units[unit]
 
 
+def active_embed(prize, winners, entries, end_timestamp, host_id, giveaway_id=None):
+    embed = discord.Embed(
+        title=f"{GIVEAWAY_EMOJI} {prize} {GIVEAWAY_EMOJI}",
+        color=discord.Color.from_rgb(0, 200, 255)
+    )
+
+    embed.description = (
+        f"{DOT} **Winners:** {winners}\n"
+        f"{DOT} **Entries:** {entries}\n"
+        f"{DOT} **Ends:** <t:{end_timestamp}:R>\n"
+        f"{DOT} **Hosted by:** <@{host_id}>\n\n"
+        f"React with {ENTRY_EMOJI} to participate!"
+    )
+
+    if giveaway_id:
+        embed.set_footer(text=f"ID: {giveaway_id}")
+
+    return embed
+
+
+class GiveawayStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.db = None
+        self.write_lock = asyncio.Lock()
+
+    async def open(self):
+        self.db = await aiosqlite.connect(self.path)
+        await self.db.execute("PRAGMA journal_mode=WAL;")
+        await self.db.execute("PRAGMA busy_timeout = 5000;")
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS giveaways (
+                message_id INTEGER PRIMARY KEY,
+                giveaway_id TEXT,
+                guild_id INTEGER,
+                channel_id INTEGER,
+                host_id INTEGER,
+                prize TEXT,
+                winners INTEGER,
+                end_timestamp INTEGER,
+                ended INTEGER DEFAULT 0
+            )
+        """)
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS giveaway_entries (
+                message_id INTEGER,
+                user_id INTEGER,
+                PRIMARY KEY (message_id, user_id)
+            )
+        """)
+        await self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_giveaways_ended_end "
+            "ON giveaways (ended, end_timestamp)"
+        )
+        await self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_giveaways_channel ON giveaways (channel_id)"
+        )
+        await self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_giveaways_gid ON giveaways (giveaway_id)"
+        )
+        await self.db.commit()
+
+    async def close(self):
+        if self.db:
+            await self.db.close()
+
+    async def fetchone(self, query, params=()):
+        async with self.db.execute(query, params) as cursor:
+            return await cursor.fetchone()
+
+    async def fetchall(self, query, params=()):
+        async with self.db.execute(query, params) as cursor:
+            return await cursor.fetchall()
+
+    async def write(self, query, params=()) -> int:
+        async with self.write_lock:
+            cursor = await self.db.execute(query, params)
+            await self.db.commit()
+            return cursor.rowcount
+
+    async def create(self, message_id, giveaway_id, guild_id, channel_id, host_id, prize, winners, end_timestamp):
+        await self.write(
+            "INSERT INTO giveaways VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (message_id, giveaway_id, guild_id, channel_id, host_id, prize, winners, end_timestamp)
+        )
+
+    async def get(self, message_id):
+        return await self.fetchone(
+            "SELECT * FROM giveaways WHERE message_id=?",
+            (message_id,)
+        )
+
+    async def find(self, giveaway_id, ended):
+        return await self.fetchone(
+            "SELECT * FROM giveaways WHERE giveaway_id=? AND ended=?",
+            (giveaway_id, ended)
+        )
+
+    async def channel_has_active(self, channel_id) -> bool:
+        row = await self.fetchone(
+            "SELECT 1 FROM giveaways WHERE channel_id=? AND ended=0",
+            (channel_id,)
+        )
+        return row is not None
+
+    async def mark_ended(self, message_id) -> bool:
+        """Flag a giveaway as ended; False if it already was."""
+        return await self.write(
+            "UPDATE giveaways SET ended=1 WHERE message_id=? AND ended=0",
+            (message_id,)
+        ) > 0
+
+    async def active(self):
+        return await self.fetchall("""
+            SELECT g.message_id, g.channel_id, g.end_timestamp, COUNT(e.user_id)
+            FROM giveaways g
+            LEFT JOIN giveaway_entries e ON e.message_id = g.message_id
+            WHERE g.ended=0
+            GROUP BY g.message_id
+        """)
+
+    async def add_entry(self, message_id, user_id) -> bool:
+        return await self.write(
+            "INSERT OR IGNORE INTO giveaway_entries VALUES (?, ?)",
+            (message_id, user_id)
+        ) > 0
+
+    async def remove_entry(self, message_id, user_id) -> bool:
+        return await self.write(
+            "DELETE FROM giveaway_entries WHERE message_id=? AND user_id=?",
+            (message_id, user_id)
+        ) > 0
+
+    async def entries(self, message_id):
+        rows = await self.fetchall(
+            "SELECT user_id FROM giveaway_entries WHERE message_id=?",
+            (message_id,)
+        )
+        return [user_id for (user_id,) in rows]
+
+    async def replace_entries(self, message_id, user_ids):
+        async with self.write_lock:
+            await self.db.execute(
+                "DELETE FROM giveaway_entries WHERE message_id=?",
+                (message_id,)
+            )
+            await self.db.executemany(
+                "INSERT OR IGNORE INTO giveaway_entries VALUES (?, ?)",
+                [(message_id, uid) for uid in user_ids]
+            )
+            await self.db.commit()
+
+
 class Giveaway(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.init_db()
-        self.bot.loop.create_task(self.resume_giveaways())
-        self.check_giveaways.start()
+        self.store = GiveawayStore(DB_PATH)
+        # message_id -> entry count for running giveaways, kept current from
+        # raw reaction events; `rendered` is what the embed last showed
+        self.entry_counts = {}
+        self.rendered = {}
+        self.dirty = set()
+        self.flush_task = None
+        # message_id -> reaction events (added, user_id) seen while that
+        # giveaway's reactions are being rescanned, replayed onto the scan
+        self.sync_events = {}
+        # min-heap of (end_timestamp, message_id) for running giveaways
+        self.deadlines = []
+        self.wakeup = asyncio.Event()
+        self.scheduler_task = None
+
+    async def cog_load(self):
+        await self.store.open()
+        self.scheduler_task = self.bot.loop.create_task(self.run_scheduler())
+
+    async def cog_unload(self):
+        if self.scheduler_task:
+            self.scheduler_task.cancel()
+        if self.flush_task:
+            self.flush_task.cancel()
+        await self.store.close()
 
     async def cog_command_error(self, ctx, error):
         if isinstance(error, commands.MissingPermissions):
             await ctx.send("You do not have permission to use giveaway commands.")
 
-    def init_db(self):
-        with sqlite3.connect(DB_PATH) as db:
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS giveaways (
-                    message_id INTEGER PRIMARY KEY,
-                    giveaway_id TEXT,
-                    guild_id INTEGER,
-                    channel_id INTEGER,
-                    host_id INTEGER,
-                    prize TEXT,
-                    winners INTEGER,
-                    end_timestamp INTEGER,
-                    ended INTEGER DEFAULT 0
-                )
-            """)
-            db.commit()
-
-    def db(self, query, params=(), fetchone=False):
-        with sqlite3.connect(DB_PATH) as db:
-            cur = db.execute(query, params)
-            db.commit()
-            return cur.fetchone() if fetchone else cur.fetchall()
-
     @commands.command(name="gstart")
     @commands.has_permissions(manage_guild=True)
     async def gstart(self, ctx, duration: str, winners: int, *, prize: str):
@@ -70,13 +227,7 @@ class Giveaway(commands.Cog):
                 "Maximum winners count is 100. Please use a number between 1 and 100."
             )
 
-        existing = self.db(
-            "SELECT 1 FROM giveaways WHERE channel_id=? AND ended=0",
-            (ctx.channel.id,),
-            fetchone=True
-        )
-
-        if existing:
+        if await self.store.channel_has_active(ctx.channel.id):
             return await ctx.send("There is already an active giveaway in this channel.")
 
         seconds = parse_duration(duration)
@@ -87,48 +238,34 @@ class Giveaway(commands.Cog):
         end_dt = now + timedelta(seconds=seconds)
         end_timestamp = int(end_dt.timestamp())
 
-        embed = discord.Embed(
-            title=f"{GIVEAWAY_EMOJI} {prize} {GIVEAWAY_EMOJI}",
-            color=discord.Color.from_rgb(0, 200, 255)
-        )
-
-        embed.description = (
-            f"{DOT} **Winners:** {winners}\n"
-            f"{DOT} **Entries:** 0\n"
-            f"{DOT} **Ends:** <t:{end_timestamp}:R>\n"
-            f"{DOT} **Hosted by:** {ctx.author.mention}\n\n"
-            f"React with {ENTRY_EMOJI} to participate!"
-        )
+        embed = active_embed(prize, winners, 0, end_timestamp, ctx.author.id)
 
         msg = await ctx.send(embed=embed)
+        self.entry_counts[msg.id] = 0
+        self.rendered[msg.id] = 0
         await msg.add_reaction(ENTRY_EMOJI)
 
         giveaway_id = str(msg.id)[-4:]
         embed.set_footer(text=f"ID: {giveaway_id}")
         await msg.edit(embed=embed)
 
-        self.db(
-            "INSERT INTO giveaways VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
-            (
-                msg.id,
-                giveaway_id,
-                ctx.guild.id,
-                ctx.channel.id,
-                ctx.author.id,
-                prize,
-                winners,
-                end_timestamp
-            )
+        await self.store.create(
+            msg.id,
+            giveaway_id,
+            ctx.guild.id,
+            ctx.channel.id,
+            ctx.author.id,
+            prize,
+            winners,
+            end_timestamp
         )
 
+        self.schedule(end_timestamp, msg.id)
+
     @commands.command(name="gend")
     @commands.has_permissions(manage_guild=True)
     async def gend(self, ctx, giveaway_id: str):
-        row = self.db(
-            "SELECT * FROM giveaways WHERE giveaway_id=? AND ended=0",
-            (giveaway_id,),
-            fetchone=True
-        )
+        row = await self.store.find(giveaway_id, ended=0)
 
         if not row:
             return await ctx.send("No active giveaway found with that ID.")
@@ -138,50 +275,194 @@ class Giveaway(commands.Cog):
     @commands.command(name="greroll")
     @commands.has_permissions(manage_guild=True)
     async def greroll(self, ctx, giveaway_id: str):
-        row = self.db(
-            "SELECT * FROM giveaways WHERE giveaway_id=? AND ended=1",
-            (giveaway_id,),
-            fetchone=True
-        )
+        row = await self.store.find(giveaway_id, ended=1)
 
         if not row:
             return await ctx.send("No ended giveaway found with that ID.")
 
         await self.pick_winner(row, reroll=True)
 
-    async def resume_giveaways(self):
+    # -------------------------
+    # END SCHEDULER
+    # -------------------------
+    def schedule(self, end_timestamp, message_id):
+        heapq.heappush(self.deadlines, (end_timestamp, message_id))
+        if self.deadlines[0][1] == message_id:
+            self.wakeup.set()
+
+    async def load_schedule(self):
+        for message_id, channel_id, end_ts, count in await self.store.active():
+            self.entry_counts[message_id] = count
+            self.rendered[message_id] = count
+            self.deadlines.append((end_ts, message_id))
+
+        heapq.heapify(self.deadlines)
+
+    async def run_scheduler(self):
+        """Sleep until the earliest deadline, end it, repeat. Giveaways ended
+        early by gend stay in the heap and are skipped when they come up."""
         await self.bot.wait_until_ready()
-        now = int(datetime.now().timestamp())
+        await self.load_schedule()
+        self.bot.loop.create_task(self.sync_entries())
 
-        rows = self.db(
-            "SELECT message_id FROM giveaways WHERE ended=0 AND end_timestamp<=?",
-            (now,)
-        )
+        while True:
+            self.wakeup.clear()
 
-        for (message_id,) in rows:
-            await self.end_giveaway(message_id)
+            if not self.deadlines:
+                await self.wakeup.wait()
+                continue
 
-    async def end_giveaway(self, message_id):
+            end_ts, message_id = self.deadlines[0]
+            delay = end_ts - time.time()
 
-        row = self.db(
-            "SELECT ended FROM giveaways WHERE message_id=?",
-            (message_id,),
-            fetchone=True
-        )
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self.deadlines)
+            self.bot.loop.create_task(self.end_giveaway(message_id))
+
+    # -------------------------
+    # ENTRIES
+    # -------------------------
+    async def fetch_reactors(self, channel_id, message_id):
+        """IDs of the users currently entered by reaction, or None if the
+        message or its reactions can't be fetched."""
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return None
 
-        if not row or row[0] == 1:
+        try:
+            message = await channel.fetch_message(message_id)
+            for reaction in message.reactions:
+                if str(reaction.emoji) == ENTRY_EMOJI:
+                    return {u.id async for u in reaction.users() if not u.bot}
+        except:
+            return None
+        return set()
+
+    async def sync_entries(self):
+        """Reconcile stored entries with the live reactions once at startup,
+        picking up anything added or removed while the bot was offline."""
+        for message_id, channel_id, end_ts, count in await self.store.active():
+            if message_id not in self.entry_counts:
+                continue
+
+            # reactions that change while the (paginated) scan runs are
+            # recorded by the listeners and applied on top of its result
+            self.sync_events[message_id] = []
+            try:
+                user_ids = await self.fetch_reactors(channel_id, message_id)
+            finally:
+                events = self.sync_events.pop(message_id)
+
+            if user_ids is None or message_id not in self.entry_counts:
+                continue
+
+            for added, user_id in events:
+                if added:
+                    user_ids.add(user_id)
+                else:
+                    user_ids.discard(user_id)
+
+            # nothing yields between popping the events and queueing on the
+            # write lock, so later reaction writes land after this one
+            await self.store.replace_entries(message_id, user_ids)
+            self.entry_counts[message_id] = len(user_ids)
+            self.mark_dirty(message_id)
+
+    def record_sync_event(self, message_id, added, user_id):
+        events = self.sync_events.get(message_id)
+        if events is not None:
+            events.append((added, user_id))
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        if payload.message_id not in self.entry_counts:
+            return
+        if str(payload.emoji) != ENTRY_EMOJI:
+            return
+        if payload.member and payload.member.bot:
             return
 
-        self.db(
-            "UPDATE giveaways SET ended=1 WHERE message_id=?",
-            (message_id,)
-        )
+        self.record_sync_event(payload.message_id, True, payload.user_id)
+        if await self.store.add_entry(payload.message_id, payload.user_id):
+            if payload.message_id in self.entry_counts:
+                self.entry_counts[payload.message_id] += 1
+                self.mark_dirty(payload.message_id)
 
-        full_row = self.db(
-            "SELECT * FROM giveaways WHERE message_id=?",
-            (message_id,),
-            fetchone=True
-        )
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        if payload.message_id not in self.entry_counts:
+            return
+        if str(payload.emoji) != ENTRY_EMOJI:
+            return
+
+        self.record_sync_event(payload.message_id, False, payload.user_id)
+        if await self.store.remove_entry(payload.message_id, payload.user_id):
+            if payload.message_id in self.entry_counts:
+                self.entry_counts[payload.message_id] -= 1
+                self.mark_dirty(payload.message_id)
+
+    def mark_dirty(self, message_id):
+        self.dirty.add(message_id)
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = self.bot.loop.create_task(self.flush_entry_counts())
+
+    async def flush_entry_counts(self):
+        """Edit each giveaway whose entry count changed since the last edit.
+        Waits FLUSH_INTERVAL first, so a burst of reactions costs one edit."""
+        await asyncio.sleep(FLUSH_INTERVAL)
+
+        dirty, self.dirty = self.dirty, set()
+        retry = []
+
+        for message_id in dirty:
+            count = self.entry_counts.get(message_id)
+            if count is None or count == self.rendered.get(message_id):
+                continue
+
+            row = await self.store.get(message_id)
+            if not row or row[8]:
+                continue
+
+            message_id, giveaway_id, guild_id, channel_id, host_id, prize, winners, end_ts, ended = row
+
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                continue
+
+            embed = active_embed(prize, winners, count, end_ts, host_id, giveaway_id)
+
+            try:
+                await channel.get_partial_message(message_id).edit(embed=embed)
+            except discord.NotFound:
+                continue
+            except discord.HTTPException:
+                retry.append(message_id)
+                continue
+
+            self.rendered[message_id] = count
+
+        self.dirty.update(retry)
+        if self.dirty:
+            self.flush_task = self.bot.loop.create_task(self.flush_entry_counts())
+
+    # -------------------------
+    # ENDING
+    # -------------------------
+    async def end_giveaway(self, message_id):
+        if not await self.store.mark_ended(message_id):
+            return
+
+        self.entry_counts.pop(message_id, None)
+        self.rendered.pop(message_id, None)
+        self.dirty.discard(message_id)
+
+        full_row = await self.store.get(message_id)
 
         await self.pick_winner(full_row)
 
@@ -196,23 +477,24 @@ class Giveaway(commands.Cog):
         if not channel:
             return
 
-        try:
-            message = await channel.fetch_message(message_id)
-        except:
-            return
+        participants = await self.store.entries(message_id)
 
-        participants = []
-        for reaction in message.reactions:
-            if str(reaction.emoji) == ENTRY_EMOJI:
-                participants = [u async for u in reaction.users() if not u.bot]
-                break
+        if reroll:
+            # entries closed when the giveaway ended, so nobody is added here;
+            # anyone who has since taken their reaction back is dropped
+            reactors = await self.fetch_reactors(channel_id, message_id)
+            if reactors is not None:
+                kept = [uid for uid in participants if uid in reactors]
+                if len(kept) != len(participants):
+                    await self.store.replace_entries(message_id, kept)
+                participants = kept
 
         if not participants:
             await channel.send("No valid participants.")
             return
 
         winners = random.sample(participants, min(winner_count, len(participants)))
-        winner_mentions = ", ".join(w.mention for w in winners)
+        winner_mentions = ", ".join(f"<@{w}>" for w in winners)
 
         if reroll:
             await channel.send(
@@ -236,65 +518,15 @@ class Giveaway(commands.Cog):
 
         embed.set_footer(text=f"ID: {giveaway_id}")
 
-        await message.edit(embed=embed)
+        try:
+            await channel.get_partial_message(message_id).edit(embed=embed)
+        except discord.HTTPException:
+            pass
 
         await channel.send(
             f"{GIVEAWAY_EMOJI} Congratulations {winner_mentions}! You won **{prize}** {GIVEAWAY_EMOJI}"
         )
 
-    @tasks.loop(seconds=10)
-    async def check_giveaways(self):
-        now = int(datetime.now().timestamp())
-
-        rows = self.db(
-            "SELECT * FROM giveaways WHERE ended=0",
-        )
-
-        for row in rows:
-            message_id, giveaway_id, guild_id, channel_id, host_id, prize, winner_count, end_ts, ended = row
-
-            guild = self.bot.get_guild(guild_id)
-            if not guild:
-                continue
-
-            channel = guild.get_channel(channel_id)
-            if not channel:
-                continue
-
-            try:
-                message = await channel.fetch_message(message_id)
-            except:
-                continue
-
-            if end_ts <= now:
-                await self.end_giveaway(message_id)
-                continue
-
-            participants = []
-            for reaction in message.reactions:
-                if str(reaction.emoji) == ENTRY_EMOJI:
-                    participants = [u async for u in reaction.users() if not u.bot]
-                    break
-
-            entry_count = len(participants)
-
-            embed = message.embeds[0]
-            desc = embed.description
-
-            new_desc = re.sub(
-                r"\*\*Entries:\*\* \d+",
-                f"**Entries:** {entry_count}",
-                desc
-            )
-
-            if new_desc != desc:
-                embed.description = new_desc
-                await message.edit(embed=embed)
-
-    @check_giveaways.before_loop
-    async def before_loop(self):
-        await self.bot.wait_until_ready()
-
 
 async def setup(bot: commands.Bot):
-    await bot.add_cog(Giveaway(bot))
\ No newline at end of file
+    await bot.add_cog(Giveaway(bot))
@@ -1,17 +1,89 @@
 import discord
 from discord.ext import commands
-import aiohttp
+import asyncio
 import random
+import time
 import urllib.parse
+from utils.prefetch import PrefetchBuffer
+
+FALLBACK = {
+    "url": "https://i.imgur.com/8Km9tLL.png",
+    "anime_name": None,
+    "artist_name": None,
+}
+
+# interaction responses must go out within 3 seconds
+INTERACTION_WAIT = 2.5
+
+# start the next source if the current one hasn't answered by then
+HEDGE_DELAY = 0.6
+# weight of the newest sample in the latency / error moving averages
+STATS_ALPHA = 0.2
+
+
+class SourceStats:
+    """Moving averages used to order the husbando sources."""
+
+    __slots__ = ("requests", "errors", "latency", "error_rate")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency = None
+        self.error_rate = 0.0
+
+    def record(self, elapsed: float, ok: bool):
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+            # a fast failure still cost the user a hedge round
+            elapsed = max(elapsed, HEDGE_DELAY)
+
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += STATS_ALPHA * (elapsed - self.latency)
+        self.error_rate += STATS_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+
+    def record_cancelled(self, elapsed: float):
+        # a hedged loser took at least this long, but never finished: raise
+        # the latency estimate only, and leave requests / error_rate alone
+        if self.latency is None:
+            self.latency = elapsed
+        elif elapsed > self.latency:
+            self.latency += STATS_ALPHA * (elapsed - self.latency)
+
+    def score(self) -> float:
+        # untried sources go first so every source gets measured
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(0.05, 1.0 - self.error_rate)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round((self.latency or 0.0) * 1000, 1),
+            "error_rate": round(self.error_rate, 3),
+        }
 
 
 class Husbando(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
+        self.session = bot.http_client
+        self.sources = {
+            "nekos.best": self._from_nekos_best,
+            "pic.re": self._from_picre,
+        }
+        self.source_stats = {name: SourceStats() for name in self.sources}
+        self.buffer = PrefetchBuffer(self.fetch_batch, key=lambda r: r["url"])
+
+    async def cog_load(self):
+        self.buffer.warm()
 
     async def cog_unload(self):
-        await self.session.close()
+        self.buffer.close()
 
     async def _from_nekos_best(self):
         async with self.session.get("https://nekos.best/api/v2/husbando") as resp:
@@ -43,27 +115,57 @@ class Husbando(commands.Cog):
                 "artist_name": data.get("artist"),
             }
 
-    async def fetch_husbando(self):
-        sources = [
-            self._from_nekos_best,
-            self._from_picre,
-        ]
-
-        random.shuffle(sources)
-
-        for source in sources:
-            try:
-                result = await source()
-                if result and result.get("url"):
-                    return result
-            except Exception:
-                continue
+    async def _timed(self, name):
+        stats = self.source_stats[name]
+        start = time.perf_counter()
+        try:
+            result = await self.sources[name]()
+        except asyncio.CancelledError:
+            stats.record_cancelled(time.perf_counter() - start)
+            raise
+        except Exception:
+            result = None
+
+        ok = bool(result and result.get("url"))
+        stats.record(time.perf_counter() - start, ok)
+        return result if ok else None
 
-        return {
-            "url": "https://i.imgur.com/8Km9tLL.png",
-            "anime_name": None,
-            "artist_name": None,
-        }
+    async def fetch_husbando(self):
+        """Hedged fetch: start the best-scoring source, add the next one
+        every HEDGE_DELAY seconds (or as soon as one fails), and return the
+        first valid answer, cancelling the rest."""
+        names = list(self.sources)
+        random.shuffle(names)
+        names.sort(key=lambda n: self.source_stats[n].score())
+
+        pending = set()
+        try:
+            while names or pending:
+                if names:
+                    pending.add(asyncio.create_task(self._timed(names.pop(0))))
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=HEDGE_DELAY if names else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    result = task.result()
+                    if result:
+                        return result
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return None
+
+    async def fetch_batch(self):
+        result = await self.fetch_husbando()
+        return [result] if result else None
+
+    async def next_husbando(self, timeout: float = 10):
+        return await self.buffer.get(timeout) or FALLBACK
 
     def build_embed(self, data, author):
         lines = []
@@ -92,7 +194,7 @@ class Husbando(commands.Cog):
 
     @commands.command(name="husbando")
     async def husbando(self, ctx: commands.Context):
-        data = await self.fetch_husbando()
+        data = await self.next_husbando()
         embed = self.build_embed(data, ctx.author)
         await ctx.send(embed=embed, view=HusbandoView(ctx, self))
 
@@ -114,7 +216,7 @@ class HusbandoView(discord.ui.View):
 
     @discord.ui.button(label="Next", style=discord.ButtonStyle.blurple)
     async def next_husbando(self, interaction: discord.Interaction, button: discord.ui.Button):
-        data = await self.cog.fetch_husbando()
+        data = await self.cog.next_husbando(INTERACTION_WAIT)
         embed = self.cog.build_embed(data, self.ctx.author)
         await interaction.response.edit_message(embed=embed, view=self)
 
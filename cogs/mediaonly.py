@@ -2,11 +2,9 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import aiosqlite
-import re
 import time
 
 DB = "mediaonly.db"
-LINK_REGEX = re.compile(r"https?://", re.IGNORECASE)
 
 
 class MediaOnly(commands.Cog):
@@ -14,9 +12,11 @@ class MediaOnly(commands.Cog):
         self.bot = bot
         self.db = None
         self.active_channels = set()
+        self.channel_ids = set()
         self.cooldowns = {}
         self.bypass_roles = {}
         self.warn_tracker = {}
+        self.handler = None
 
     async def cog_load(self):
         self.db = await aiosqlite.connect(DB)
@@ -49,6 +49,7 @@ class MediaOnly(commands.Cog):
         async with self.db.execute("SELECT guild_id, channel_id FROM media_only") as c:
             for g, ch in await c.fetchall():
                 self.active_channels.add((g, ch))
+                self.channel_ids.add(ch)
 
         async with self.db.execute("SELECT guild_id, cooldown FROM media_settings") as c:
             for g, cd in await c.fetchall():
@@ -58,6 +59,13 @@ class MediaOnly(commands.Cog):
             for g, r in await c.fetchall():
                 self.bypass_roles.setdefault(g, set()).add(r)
 
+        self.handler = self.bot.router.register(
+            self.on_message, channels=self.channel_ids, commands=True
+        )
+
+    async def cog_unload(self):
+        self.bot.router.unregister(self.handler)
+
     @app_commands.command(name="mediaonly",
                          description="Configure media-only channels and settings.")
     @app_commands.guild_only()
@@ -68,22 +76,14 @@ class MediaOnly(commands.Cog):
         await interaction.response.send_message(view=view)
         view.message = await interaction.original_response()
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if not message.guild:
-            return
-
-        if (message.guild.id, message.channel.id) not in self.active_channels:
-            return
-
-        if message.author.bot:
-            return
+    async def on_message(self, parsed):
+        message: discord.Message = parsed.message
 
         bypass = self.bypass_roles.get(message.guild.id, set())
         if any(role.id in bypass for role in message.author.roles):
             return
 
-        if message.attachments or LINK_REGEX.search(message.content):
+        if parsed.has_attachments or parsed.has_link:
             return
 
         try:
@@ -208,6 +208,7 @@ class MediaOnlyDashboard(discord.ui.LayoutView):
         await self.cog.db.commit()
 
         self.cog.active_channels.add((self.guild.id, cid))
+        self.cog.channel_ids.add(cid)
 
         self.build()
         await interaction.response.edit_message(view=self)
@@ -284,6 +285,7 @@ class RemoveChannelView(discord.ui.View):
         await self.cog.db.commit()
 
         self.cog.active_channels.discard((self.guild.id, cid))
+        self.cog.channel_ids.discard(cid)
 
         self.parent.build()
         await self.parent.message.edit(view=self.parent)
@@ -1,21 +1,6 @@
 import discord
 from discord.ext import commands
 from datetime import datetime, timezone
-import json
-import os
-
-PREFIX_FILE = "prefixes.json"
-DEFAULT_PREFIX = ","
-
-
-def get_prefix(guild_id: int) -> str:
-    if not os.path.exists(PREFIX_FILE):
-        return DEFAULT_PREFIX
-
-    with open(PREFIX_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    return data.get(str(guild_id), DEFAULT_PREFIX)
 
 
 class BotMentionView(discord.ui.LayoutView):
@@ -73,10 +58,18 @@ class MessageEvent(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.start_time = datetime.now(timezone.utc)
+        self.handler = None
+
+    async def cog_load(self):
+        self.handler = self.bot.router.register(self.on_message, mentions=True)
+
+    async def cog_unload(self):
+        self.bot.router.unregister(self.handler)
+
+    async def on_message(self, parsed):
+        message: discord.Message = parsed.message
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
+        if self.bot.user.id not in parsed.mention_ids:
             return
 
         if message.content.strip() not in (
@@ -95,10 +88,9 @@ class MessageEvent(commands.Cog):
         else:
             uptime = f"{seconds // 3600}h {(seconds % 3600) // 60}m"
 
-        prefix = get_prefix(message.guild.id)
-        ctx = await self.bot.get_context(message)
+        prefix = parsed.prefix
 
-        await ctx.send(
+        await message.channel.send(
             view=BotMentionView(
                 bot=self.bot,
                 author=message.author,
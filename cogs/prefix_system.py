@@ -1,31 +1,15 @@
 import discord
 from discord.ext import commands
-import json
-import os
-
-PREFIX_FILE = "prefixes.json"
 
 class PrefixSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-
-    def load_prefixes(self):
-        if not os.path.exists(PREFIX_FILE):
-            with open(PREFIX_FILE, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-        with open(PREFIX_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def save_prefixes(self, prefixes: dict):
-        with open(PREFIX_FILE, "w", encoding="utf-8") as f:
-            json.dump(prefixes, f, indent=4)
+        self.prefixes = bot.prefixes
 
     @commands.command(name="setprefix")
     @commands.has_permissions(administrator=True)
     async def setprefix(self, ctx, prefix: str):
-        prefixes = self.load_prefixes()
-        prefixes[str(ctx.guild.id)] = prefix
-        self.save_prefixes(prefixes)
+        await self.prefixes.set(ctx.guild.id, prefix)
 
         embed = discord.Embed(
             title="<a:1000033630:1433575320782372995> Prefix Updated",
@@ -41,12 +25,7 @@ class PrefixSystem(commands.Cog):
     @commands.command(name="removeprefix")
     @commands.has_permissions(administrator=True)
     async def removeprefix(self, ctx):
-        prefixes = self.load_prefixes()
-        gid = str(ctx.guild.id)
-
-        if gid in prefixes:
-            del prefixes[gid]
-            self.save_prefixes(prefixes)
+        if await self.prefixes.remove(ctx.guild.id):
             desc = "Custom prefix removed. Default prefix is now `,`."
             color = discord.Color.orange()
         else:
@@ -58,8 +37,7 @@ class PrefixSystem(commands.Cog):
 
     @commands.command(name="listprefix")
     async def listprefix(self, ctx):
-        prefixes = self.load_prefixes()
-        current = prefixes.get(str(ctx.guild.id), ",")
+        current = self.prefixes.get(ctx.guild.id)
 
         embed = discord.Embed(
             title="Current Prefix",
@@ -2,139 +2,157 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import aiohttp
+from functools import lru_cache
+import asyncio
 import io
 import textwrap
 
+FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+BOT_NAME = "Furina"
+
+WIDTH, HEIGHT = 1200, 600
+LEFT_WIDTH = 550
+FADE_WIDTH = 250
+
+
+@lru_cache(maxsize=64)
+def get_font(size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(FONT_PATH, size)
+
+
+def build_fade_mask() -> Image.Image:
+    """Opaque left edge fading linearly to transparent over the last
+    FADE_WIDTH columns; built as one row and stretched to full height."""
+    fade_start = LEFT_WIDTH - FADE_WIDTH
+    row = bytes(
+        255 if x <= fade_start else int(255 * (1 - (x - fade_start) / FADE_WIDTH))
+        for x in range(LEFT_WIDTH)
+    )
+    return Image.frombytes("L", (LEFT_WIDTH, 1), row).resize((LEFT_WIDTH, HEIGHT), Image.NEAREST)
+
+
+FADE_MASK = build_fade_mask()
+
+
+def render_quote(avatar: Image.Image, name: str, text: str) -> io.BytesIO:
+    """Build the quote card from a LEFT_WIDTH x HEIGHT avatar (left
+    untouched)."""
+    bg = avatar.convert("RGB").resize((WIDTH, HEIGHT))
+    bg = bg.filter(ImageFilter.GaussianBlur(30))
+
+    overlay = Image.new("RGBA", (WIDTH, HEIGHT), (255, 255, 255, 140))
+    bg = bg.convert("RGBA")
+    bg = Image.alpha_composite(bg, overlay)
+
+    avatar_rgba = avatar.copy()
+    avatar_rgba.putalpha(FADE_MASK)
+    bg.paste(avatar_rgba, (0, 0), avatar_rgba)
+
+    draw = ImageDraw.Draw(bg)
+
+    max_font_size = 55
+    min_font_size = 28
+    spacing = 12
+
+    quote_area_start = LEFT_WIDTH
+    quote_area_width = WIDTH - LEFT_WIDTH
+    center_x = quote_area_start + quote_area_width // 2
+    center_y = HEIGHT // 2
+
+    safe_top = 150
+    safe_bottom = HEIGHT - 200
+    max_height = safe_bottom - safe_top
+
+    wrapped = textwrap.fill(text, width=28)
+
+    def measure(size):
+        return draw.multiline_textbbox((0, 0), wrapped, font=get_font(size), spacing=spacing)
+
+    # Text height grows with font size, so binary search the candidate
+    # sizes for the largest one that fits; fall back to the smallest.
+    sizes = list(range(min_font_size + 1, max_font_size + 1, 2))
+    lo, hi = 0, len(sizes) - 1
+    font_size = sizes[0]
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        b = measure(sizes[mid])
+        if b[3] - b[1] <= max_height:
+            font_size = sizes[mid]
+            lo = mid + 1
+        else:
+            hi = mid - 1
+
+    quote_font = get_font(font_size)
+    bbox = measure(font_size)
+
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+
+    text_x = center_x - text_width // 2
+    text_y = center_y - text_height // 2
+
+    name_font = get_font(int(font_size * 0.7))
+    big_quote_font = get_font(160)
+    watermark_font = get_font(26)
+
+    draw.text(
+        (WIDTH // 2 - 40, 40),
+        "â€œ",
+        font=big_quote_font,
+        fill=(150, 150, 150, 70)
+    )
+
+    draw.multiline_text(
+        (text_x, text_y),
+        wrapped,
+        font=quote_font,
+        fill=(40, 40, 40),
+        spacing=spacing,
+        align="center"
+    )
+
+    draw.text(
+        (WIDTH - 140, HEIGHT - 160),
+        "â€",
+        font=big_quote_font,
+        fill=(150, 150, 150, 70)
+    )
+
+    name_text = f"- {name}"
+    name_bbox = draw.textbbox((0, 0), name_text, font=name_font)
+    name_width = name_bbox[2] - name_bbox[0]
+
+    draw.text(
+        (center_x - name_width // 2, text_y + text_height + 30),
+        name_text,
+        font=name_font,
+        fill=(110, 110, 110)
+    )
+
+    watermark_bbox = draw.textbbox((0, 0), f"{BOT_NAME}", font=watermark_font)
+    watermark_width = watermark_bbox[2] - watermark_bbox[0]
+
+    draw.text(
+        (WIDTH - watermark_width - 30, HEIGHT - 45),
+        f"{BOT_NAME}",
+        font=watermark_font,
+        fill=(120, 120, 120, 120)
+    )
+
+    buffer = io.BytesIO()
+    bg.convert("RGB").save(buffer, format="PNG", compress_level=3)
+    buffer.seek(0)
+
+    return buffer
+
 
 class Quote(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-        self.BOT_NAME = "Furina"
 
     async def generate_quote_image(self, user, text):
-        WIDTH, HEIGHT = 1200, 600
-        LEFT_WIDTH = 550
-        FADE_WIDTH = 250
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(user.display_avatar.url) as resp:
-                avatar_bytes = await resp.read()
-
-        avatar = Image.open(io.BytesIO(avatar_bytes)).convert("RGB")
-
-        bg = avatar.resize((WIDTH, HEIGHT))
-        bg = bg.filter(ImageFilter.GaussianBlur(30))
-
-        overlay = Image.new("RGBA", (WIDTH, HEIGHT), (255, 255, 255, 140))
-        bg = bg.convert("RGBA")
-        bg = Image.alpha_composite(bg, overlay)
-
-        avatar_left = avatar.resize((LEFT_WIDTH, HEIGHT))
-
-        mask = Image.new("L", (LEFT_WIDTH, HEIGHT), 255)
-        mask_data = mask.load()
-
-        for x in range(LEFT_WIDTH):
-            if x > LEFT_WIDTH - FADE_WIDTH:
-                distance = x - (LEFT_WIDTH - FADE_WIDTH)
-                alpha = int(255 * (1 - distance / FADE_WIDTH))
-                for y in range(HEIGHT):
-                    mask_data[x, y] = alpha
-
-        avatar_rgba = avatar_left.convert("RGBA")
-        avatar_rgba.putalpha(mask)
-        bg.paste(avatar_rgba, (0, 0), avatar_rgba)
-
-        draw = ImageDraw.Draw(bg)
-
-        max_font_size = 55
-        min_font_size = 28
-        spacing = 12
-
-        quote_area_start = LEFT_WIDTH
-        quote_area_width = WIDTH - LEFT_WIDTH
-        center_x = quote_area_start + quote_area_width // 2
-        center_y = HEIGHT // 2
-
-        safe_top = 150
-        safe_bottom = HEIGHT - 200
-        max_height = safe_bottom - safe_top
-
-        font_size = max_font_size
-
-        while font_size >= min_font_size:
-            quote_font = ImageFont.truetype(self.FONT_PATH, font_size)
-            wrapped = textwrap.fill(text, width=28)
-
-            bbox = draw.multiline_textbbox((0, 0), wrapped, font=quote_font, spacing=spacing)
-            text_height = bbox[3] - bbox[1]
-
-            if text_height <= max_height:
-                break
-
-            font_size -= 2
-
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-
-        text_x = center_x - text_width // 2
-        text_y = center_y - text_height // 2
-
-        name_font = ImageFont.truetype(self.FONT_PATH, int(font_size * 0.7))
-        big_quote_font = ImageFont.truetype(self.FONT_PATH, 160)
-        watermark_font = ImageFont.truetype(self.FONT_PATH, 26)
-
-        draw.text(
-            (WIDTH // 2 - 40, 40),
-            "â€œ",
-            font=big_quote_font,
-            fill=(150, 150, 150, 70)
-        )
-
-        draw.multiline_text(
-            (text_x, text_y),
-            wrapped,
-            font=quote_font,
-            fill=(40, 40, 40),
-            spacing=spacing,
-            align="center"
-        )
-
-        draw.text(
-            (WIDTH - 140, HEIGHT - 160),
-            "â€",
-            font=big_quote_font,
-            fill=(150, 150, 150, 70)
-        )
-
-        name_text = f"- {user.name}"
-        name_bbox = draw.textbbox((0, 0), name_text, font=name_font)
-        name_width = name_bbox[2] - name_bbox[0]
-
-        draw.text(
-            (center_x - name_width // 2, text_y + text_height + 30),
-            name_text,
-            font=name_font,
-            fill=(110, 110, 110)
-        )
-
-        watermark_bbox = draw.textbbox((0, 0), f"{self.BOT_NAME}", font=watermark_font)
-        watermark_width = watermark_bbox[2] - watermark_bbox[0]
-
-        draw.text(
-            (WIDTH - watermark_width - 30, HEIGHT - 45),
-            f"{self.BOT_NAME}",
-            font=watermark_font,
-            fill=(120, 120, 120, 120)
-        )
-
-        buffer = io.BytesIO()
-        bg.convert("RGB").save(buffer, format="PNG")
-        buffer.seek(0)
-
-        return buffer
+        avatar = await self.bot.avatars.get(user.display_avatar, (LEFT_WIDTH, HEIGHT))
+        return await asyncio.to_thread(render_quote, avatar, user.name, text)
 
     @app_commands.command(name="quote", description="Create quote image")
     @app_commands.describe(text="Quote text")
@@ -1,43 +1,177 @@
 import discord
 from discord.ext import commands, tasks
-import aiohttp
 import asyncio
+import heapq
 import json
 import random
 import os
+import re
+import time
+import typing
+from utils.image_hash import dhash, HashIndex
 
 MEME_FILE = "meme_channels.json"
+HASH_FILE = "meme_hashes.json"
 SUBREDDITS = ["memes", "funny", "wholesomememes", "memesirl", "dankmemes", "meme"]
 OWNER_ID = 832459817485860894
 
+REDDIT_API = "https://www.reddit.com/r/{subreddit}/hot.json?limit=50"
+MEME_API = "https://meme-api.com/gimme/"
+IMGFLIP_API = "https://api.imgflip.com/get_memes"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+BATCH_SIZE = 50
+# perceptual hashes of the memes each guild was sent; a candidate within
+# DUPLICATE_DISTANCE bits of any of them is treated as a repost
+HASH_HISTORY = 500
+HASH_MAX_AGE = 30 * 24 * 60 * 60
+DUPLICATE_DISTANCE = 6
+# images downloaded and hashed per post before giving up
+MAX_DOWNLOADS = 5
+MAX_IMAGE_BYTES = 8 * 1024 * 1024
+SEND_CONCURRENCY = 10
+# a fetched batch is shared by every guild posting from that subreddit
+BATCH_TTL = 10 * 60
+ALERT_COOLDOWN = 30 * 60
+
+# minutes between posts, per guild
+DEFAULT_INTERVAL = 5
+MIN_INTERVAL = 1
+MAX_INTERVAL = 24 * 60
+MAX_SUBREDDITS = 10
+SUBREDDIT_REGEX = re.compile(r"^(?:r/)?([A-Za-z0-9_]{2,21})$")
+
+
+def channel_config(value):
+    """Older meme_channels.json files map guild -> channel id only."""
+    if isinstance(value, int):
+        return {"channel": value, "interval": DEFAULT_INTERVAL, "subreddits": []}
+    value.setdefault("interval", DEFAULT_INTERVAL)
+    value.setdefault("subreddits", [])
+    return value
+
+
 class MemeAutoPost(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.meme_channels = self.load_meme_channels()
-        self.sent_memes = set()
+        self.sent_hashes = {}
+        self.hashes_dirty = False
         self.failure_counts = {}
-        self.send_memes.start()
+        # posts skipped because every candidate was a repost; not a failure
+        self.stale_counts = {}
+        self.last_alert = 0.0
+        self.batches = {}
+        self.semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+        # min-heap of (due_timestamp, guild_id); self.due holds each guild's
+        # live due time so entries left behind by setmeme/deletememe are skipped
+        self.schedule = []
+        self.due = {}
+        self.wakeup = asyncio.Event()
+        self.scheduler_task = None
+
+    async def cog_load(self):
+        saved = await asyncio.to_thread(self.load_hashes)
+        for guild_id, entries in saved.items():
+            self.sent_hashes[guild_id] = self.new_index(entries)
+        self.save_hashes_loop.start()
+        self.scheduler_task = self.bot.loop.create_task(self.run_scheduler())
 
-    def cog_unload(self):
-        self.send_memes.cancel()
+    async def cog_unload(self):
+        if self.scheduler_task:
+            self.scheduler_task.cancel()
+        self.save_hashes_loop.cancel()
+        if self.hashes_dirty:
+            await self.save_hashes()
 
     def load_meme_channels(self):
         if os.path.exists(MEME_FILE):
             with open(MEME_FILE, "r") as f:
-                return json.load(f)
+                return {g: channel_config(c) for g, c in json.load(f).items()}
         return {}
 
     def save_meme_channels(self):
         with open(MEME_FILE, "w") as f:
             json.dump(self.meme_channels, f, indent=4)
 
+    # -------------------------
+    # Duplicate index
+    # -------------------------
+
+    def new_index(self, entries=()):
+        return HashIndex(HASH_HISTORY, HASH_MAX_AGE, DUPLICATE_DISTANCE, entries)
+
+    def load_hashes(self):
+        if not os.path.exists(HASH_FILE):
+            return {}
+        try:
+            with open(HASH_FILE, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write_hashes(self, data):
+        tmp = HASH_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, HASH_FILE)
+
+    async def save_hashes(self):
+        self.hashes_dirty = False
+        data = {g: index.dump() for g, index in self.sent_hashes.items() if len(index)}
+        await asyncio.to_thread(self.write_hashes, data)
+
+    @tasks.loop(minutes=5)
+    async def save_hashes_loop(self):
+        if self.hashes_dirty:
+            await self.save_hashes()
+
     @commands.command(name="setmeme")
     @commands.has_permissions(manage_channels=True)
-    async def set_meme_channel(self, ctx, channel: discord.TextChannel = None):
+    async def set_meme_channel(
+        self,
+        ctx,
+        channel: typing.Optional[discord.TextChannel] = None,
+        interval: typing.Optional[int] = None,
+        *subreddits: str
+    ):
+        """setmeme [channel] [minutes] [subreddit ...]"""
+        guild_id = str(ctx.guild.id)
+        config = self.meme_channels.get(guild_id)
+
+        if interval is None:
+            interval = config["interval"] if config else DEFAULT_INTERVAL
+        if not MIN_INTERVAL <= interval <= MAX_INTERVAL:
+            return await ctx.send(f"❌ Interval must be between {MIN_INTERVAL} and {MAX_INTERVAL} minutes.")
+
+        if subreddits:
+            names = []
+            for name in subreddits:
+                match = SUBREDDIT_REGEX.match(name)
+                if not match:
+                    return await ctx.send(f"❌ `{name}` is not a valid subreddit name.")
+                if match.group(1).lower() not in names:
+                    names.append(match.group(1).lower())
+            if len(names) > MAX_SUBREDDITS:
+                return await ctx.send(f"❌ At most {MAX_SUBREDDITS} subreddits.")
+        else:
+            names = config["subreddits"] if config else []
+
         channel = channel or ctx.channel
-        self.meme_channels[str(ctx.guild.id)] = channel.id
+        self.meme_channels[guild_id] = {
+            "channel": channel.id,
+            "interval": interval,
+            "subreddits": names
+        }
         self.save_meme_channels()
-        await ctx.send(f"✅ Meme channel set to {channel.mention}")
+
+        # random phase so guilds configured together don't post together
+        self.schedule_guild(guild_id, time.time() + interval * 60 * random.random())
+
+        sources = ", ".join(f"r/{n}" for n in names) or "the default subreddits"
+        await ctx.send(
+            f"✅ Meme channel set to {channel.mention}, posting every "
+            f"{interval} min from {sources}"
+        )
 
     @commands.command(name="deletememe")
     @commands.has_permissions(manage_channels=True)
@@ -45,116 +179,249 @@ class MemeAutoPost(commands.Cog):
         guild_id = str(ctx.guild.id)
         if guild_id in self.meme_channels:
             del self.meme_channels[guild_id]
+            self.due.pop(guild_id, None)
+            if self.sent_hashes.pop(guild_id, None) is not None:
+                self.hashes_dirty = True
             self.save_meme_channels()
             await ctx.send("🗑️ Meme channel removed.")
         else:
             await ctx.send("❌ No meme channel set for this server.")
 
-    @tasks.loop(minutes=5)
-    async def send_memes(self):
-        meme_apis = [
-            "https://meme-api.com/gimme/",
-            "https://www.reddit.com/r/{subreddit}/hot.json?limit=50",
-            "https://api.imgflip.com/get_memes"
+    # -------------------------
+    # Fetching
+    # -------------------------
+
+    async def fetch_reddit(self, session, subreddit):
+        url = REDDIT_API.format(subreddit=subreddit)
+        headers = {"User-Agent": "DiscordBot/1.0"}
+        async with session.get(url, headers=headers, timeout=10) as resp:
+            data = await resp.json()
+
+        memes = []
+        for child in data.get("data", {}).get("children", []):
+            post = child.get("data", {})
+            if post.get("stickied") or post.get("over_18"):
+                continue
+            url = post.get("url_overridden_by_dest")
+            if not url or not url.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            memes.append((url, post.get("title"), f"https://reddit.com{post.get('permalink')}"))
+        return memes
+
+    async def fetch_meme_api(self, session, subreddit):
+        url = f"{MEME_API}{subreddit}/{BATCH_SIZE}"
+        async with session.get(url, timeout=10) as resp:
+            data = await resp.json()
+
+        return [
+            (m.get("url"), m.get("title"), m.get("postLink"))
+            for m in data.get("memes", [])
+            if m.get("url") and not m.get("nsfw")
         ]
 
-        async with aiohttp.ClientSession() as session:
-            for guild_id, channel_id in self.meme_channels.items():
-                channel = self.bot.get_channel(channel_id)
-                if not channel:
-                    continue
-
-                subreddit = random.choice(SUBREDDITS)
-                meme_data = None
-
-                # --- Try each API with retries ---
-                for attempt in range(3):
-                    for api in meme_apis:
-                        try:
-                            if "meme-api.com" in api:
-                                url = f"{api}{subreddit}"
-                                async with session.get(url, timeout=10) as resp:
-                                    data = await resp.json()
-                                    meme_data = (
-                                        data.get("url"),
-                                        data.get("title"),
-                                        data.get("postLink")
-                                    )
-
-                            elif "reddit.com" in api:
-                                url = api.format(subreddit=subreddit)
-                                headers = {"User-Agent": "DiscordBot/1.0"}
-                                async with session.get(url, headers=headers, timeout=10) as resp:
-                                    data = await resp.json()
-                                    posts = data.get("data", {}).get("children", [])
-                                    post = random.choice(posts)["data"]
-                                    meme_data = (
-                                        post.get("url_overridden_by_dest"),
-                                        post.get("title"),
-                                        f"https://reddit.com{post.get('permalink')}"
-                                    )
-
-                            elif "imgflip" in api:
-                                async with session.get(api, timeout=10) as resp:
-                                    data = await resp.json()
-                                    meme = random.choice(data["data"]["memes"])
-                                    meme_data = (
-                                        meme.get("url"),
-                                        meme.get("name"),
-                                        "https://imgflip.com/"
-                                    )
-
-                            if meme_data[0]:
-                                break
-
-                        except Exception as e:
-                            print(f"⚠️ API error (attempt {attempt+1}) from {api}: {e}")
-                            await asyncio.sleep(2)
-
-                    if meme_data:
-                        break
-
-                if not meme_data:
-                    print(f"❌ Failed to fetch meme for guild {guild_id}.")
-                    self.failure_counts[guild_id] = self.failure_counts.get(guild_id, 0) + 1
-
-                    if self.failure_counts[guild_id] % 3 == 0:
-                        owner = self.bot.get_user(OWNER_ID)
-                        if owner:
-                            try:
-                                await owner.send(
-                                    f"⚠️ Meme auto-post failed 3 times in guild `{guild_id}`.\n"
-                                    f"Possible API outage."
-                                )
-                            except:
-                                pass
-                    continue
-
-                meme_url, title, post_link = meme_data
-
-                if meme_url in self.sent_memes:
-                    continue
-
-                self.sent_memes.add(meme_url)
-                if len(self.sent_memes) > 100:
-                    self.sent_memes.pop()
-
-                embed = discord.Embed(
-                    title=title or "Random Meme 😂",
-                    url=post_link,
-                    color=discord.Color.random()
-                )
-                embed.set_image(url=meme_url)
-                embed.set_footer(text=f"From r/{subreddit}")
+    async def fetch_imgflip(self, session, subreddit):
+        async with session.get(IMGFLIP_API, timeout=10) as resp:
+            data = await resp.json()
 
+        return [
+            (m.get("url"), m.get("name"), "https://imgflip.com/")
+            for m in data["data"]["memes"]
+            if m.get("url")
+        ]
+
+    async def fetch_batch(self, subreddit):
+        """Up to BATCH_SIZE memes for one subreddit, trying each API in turn."""
+        session = self.bot.http_client
+        sources = (self.fetch_reddit, self.fetch_meme_api, self.fetch_imgflip)
+
+        for attempt in range(3):
+            for source in sources:
                 try:
-                    await channel.send(embed=embed)
+                    memes = await source(session, subreddit)
+                    if memes:
+                        random.shuffle(memes)
+                        return memes
                 except Exception as e:
-                    print(f"❌ Could not send meme in guild {guild_id}: {e}")
+                    print(f"⚠️ API error (attempt {attempt+1}) from {source.__name__}: {e}")
+            if attempt < 2:
+                await asyncio.sleep(2)
+
+        return []
 
-    @send_memes.before_loop
-    async def before_memes(self):
+    # -------------------------
+    # Posting
+    # -------------------------
+
+    async def get_batch(self, subreddit):
+        """Cached fetch_batch; concurrent callers share one request."""
+        now = time.time()
+        entry = self.batches.get(subreddit)
+        if entry and entry[0] > now:
+            return await asyncio.shield(entry[1])
+
+        task = self.bot.loop.create_task(self.fetch_batch(subreddit))
+        self.batches[subreddit] = (now + BATCH_TTL, task)
+        memes = await asyncio.shield(task)
+        if not memes and self.batches.get(subreddit, (None, None))[1] is task:
+            del self.batches[subreddit]
+        return memes
+
+    async def meme_hash(self, url):
+        """dHash of the image at url; None if it can't be fetched or decoded."""
+        try:
+            async with self.bot.http_client.get(url, timeout=15) as resp:
+                if resp.status != 200:
+                    return None
+                if (resp.content_length or 0) > MAX_IMAGE_BYTES:
+                    return None
+                data = await resp.read()
+            if len(data) > MAX_IMAGE_BYTES:
+                return None
+            return await asyncio.to_thread(dhash, data)
+        except Exception:
+            return None
+
+    async def pick_meme(self, guild_id, memes):
+        index = self.sent_hashes.get(guild_id)
+        if index is None:
+            index = self.sent_hashes[guild_id] = self.new_index()
+
+        # start each guild at a different point so they don't all get the same one
+        offset = random.randrange(len(memes)) if memes else 0
+
+        for meme in (memes[offset:] + memes[:offset])[:MAX_DOWNLOADS]:
+            h = await self.meme_hash(meme[0])
+            if h is None:
+                continue
+            now = time.time()
+            if index.is_duplicate(h, now):
+                continue
+            index.add(h, now)
+            self.hashes_dirty = True
+            return meme
+        return None
+
+    async def post_meme(self, guild_id, channel, subreddit, meme):
+        meme_url, title, post_link = meme
+
+        embed = discord.Embed(
+            title=title or "Random Meme 😂",
+            url=post_link,
+            color=discord.Color.random()
+        )
+        embed.set_image(url=meme_url)
+        embed.set_footer(text=f"From r/{subreddit}")
+
+        async with self.semaphore:
+            try:
+                await channel.send(embed=embed)
+            except Exception as e:
+                print(f"❌ Could not send meme in guild {guild_id}: {e}")
+
+    async def report_failure(self, guild_id):
+        now = time.time()
+        if now - self.last_alert < ALERT_COOLDOWN:
+            return
+        self.last_alert = now
+
+        owner = self.bot.get_user(OWNER_ID)
+        if not owner:
+            return
+        try:
+            await owner.send(
+                f"⚠️ Meme auto-post failed 3 times in guild `{guild_id}`.\n"
+                f"Possible API outage."
+            )
+        except:
+            pass
+
+    async def post_for_guild(self, guild_id):
+        config = self.meme_channels.get(guild_id)
+        if not config:
+            return
+        channel = self.bot.get_channel(config["channel"])
+        if not channel:
+            return
+
+        subreddit = random.choice(config["subreddits"] or SUBREDDITS)
+        memes = await self.get_batch(subreddit)
+
+        if not memes:
+            print(f"❌ Failed to fetch meme for guild {guild_id}.")
+            self.failure_counts[guild_id] = self.failure_counts.get(guild_id, 0) + 1
+            if self.failure_counts[guild_id] % 3 == 0:
+                await self.report_failure(guild_id)
+            return
+
+        self.failure_counts.pop(guild_id, None)
+
+        meme = await self.pick_meme(guild_id, memes)
+        if not meme:
+            self.stale_counts[guild_id] = self.stale_counts.get(guild_id, 0) + 1
+            print(f"⏭️ Nothing new to post from r/{subreddit} for guild {guild_id}.")
+            return
+
+        self.stale_counts.pop(guild_id, None)
+        await self.post_meme(guild_id, channel, subreddit, meme)
+
+    # -------------------------
+    # Scheduler
+    # -------------------------
+
+    def schedule_guild(self, guild_id, due):
+        self.due[guild_id] = due
+        heapq.heappush(self.schedule, (due, guild_id))
+        if self.schedule[0][1] == guild_id:
+            self.wakeup.set()
+
+    def load_schedule(self):
+        """Spread the configured guilds evenly across their intervals."""
+        now = time.time()
+        guild_ids = sorted(self.meme_channels)
+        for i, guild_id in enumerate(guild_ids):
+            interval = self.meme_channels[guild_id]["interval"] * 60
+            self.schedule_guild(guild_id, now + interval * (i + 1) / len(guild_ids))
+
+    async def run_scheduler(self):
+        """Sleep until the next guild is due, post for it, reschedule it one
+        interval later, repeat."""
         await self.bot.wait_until_ready()
+        self.load_schedule()
+
+        while True:
+            self.wakeup.clear()
+
+            if not self.schedule:
+                await self.wakeup.wait()
+                continue
+
+            due, guild_id = self.schedule[0]
+            delay = due - time.time()
+
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self.schedule)
+            if self.due.get(guild_id) != due:
+                continue
+
+            config = self.meme_channels.get(guild_id)
+            if not config:
+                self.due.pop(guild_id, None)
+                continue
+
+            # keep the guild's phase unless we've fallen a whole interval behind
+            interval = config["interval"] * 60
+            next_due = due + interval
+            if next_due <= time.time():
+                next_due = time.time() + interval
+            self.schedule_guild(guild_id, next_due)
+
+            self.bot.loop.create_task(self.post_for_guild(guild_id))
 
 async def setup(bot):
     await bot.add_cog(MemeAutoPost(bot))
@@ -3,18 +3,161 @@ from discord.ext import commands
 from discord import app_commands
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import aiohttp
+from functools import lru_cache
+import asyncio
 import os
 import random
 import math
 
 ASSETS_PATH = "/home/container/assets"
+FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+WIDTH, HEIGHT = 900, 520
+AVATAR_SIZE = 180
+LEFT_X = 180
+RIGHT_X = WIDTH - 360
+Y_AVATAR = 150
+
+BAR_WIDTH = 600
+BAR_HEIGHT = 35
+BAR_X = (WIDTH - BAR_WIDTH) // 2
+BAR_Y = 370
+
+
+@lru_cache(maxsize=8)
+def heart_points(size):
+    """Outline of the parametric heart, relative to its centre."""
+    points = []
+    for t in range(0, 360):
+        angle = math.radians(t)
+        px = size * 16 * math.sin(angle) ** 3
+        py = -size * (
+            13 * math.cos(angle)
+            - 5 * math.cos(2 * angle)
+            - 2 * math.cos(3 * angle)
+            - math.cos(4 * angle)
+        )
+        points.append((px / 16, py / 16))
+    return tuple(points)
+
+
+def draw_real_heart(draw, x, y, size, color):
+    draw.polygon([(x + px, y + py) for px, py in heart_points(size)], fill=color)
+
+
+def load_fonts():
+    try:
+        return ImageFont.truetype(FONT_BOLD, 48), ImageFont.truetype(FONT_BOLD, 42)
+    except:
+        return ImageFont.load_default(), ImageFont.load_default()
+
+
+def build_avatar_mask():
+    mask = Image.new("L", (AVATAR_SIZE, AVATAR_SIZE), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, AVATAR_SIZE, AVATAR_SIZE), fill=255)
+    return mask
+
+
+def prepare_background(path):
+    """Everything on the card that doesn't depend on the users: the blurred,
+    darkened background, the heart and the empty progress bar."""
+    bg = Image.open(path).convert("RGBA")
+    bg = bg.resize((WIDTH, HEIGHT))
+    bg = bg.filter(ImageFilter.GaussianBlur(3))
+
+    overlay = Image.new("RGBA", (WIDTH, HEIGHT), (0, 0, 0, 40))
+    bg = Image.alpha_composite(bg, overlay)
+
+    draw = ImageDraw.Draw(bg)
+
+    heart_x = WIDTH // 2
+    heart_y = Y_AVATAR + 85
+    draw_real_heart(draw, heart_x, heart_y, 72, (255, 255, 255))
+    draw_real_heart(draw, heart_x, heart_y, 70, (255, 30, 30))
+
+    draw.rounded_rectangle(
+        (BAR_X, BAR_Y, BAR_X + BAR_WIDTH, BAR_Y + BAR_HEIGHT),
+        radius=25,
+        fill=(40, 40, 40)
+    )
+    return bg
+
+
+def load_backgrounds():
+    # one unreadable file is skipped rather than failing the whole set
+    try:
+        names = sorted(os.listdir(ASSETS_PATH))
+    except OSError:
+        return []
+
+    backgrounds = []
+    for f in names:
+        if not f.lower().endswith(".jpg"):
+            continue
+        try:
+            backgrounds.append(prepare_background(os.path.join(ASSETS_PATH, f)))
+        except Exception as e:
+            print(f"Ship background {f} skipped: {e!r}")
+    return backgrounds
+
+
+FONT_BIG, FONT_SMALL = load_fonts()
+AVATAR_MASK = build_avatar_mask()
+
+
+def round_avatar(avatar):
+    avatar = avatar.copy()
+    avatar.putalpha(AVATAR_MASK)
+    return avatar
+
+
+def render_ship(background, avatar1, avatar2, name1, name2, compatibility):
+    """Draw the per-pair parts of the card from two AVATAR_SIZE avatars."""
+    avatar1 = round_avatar(avatar1)
+    avatar2 = round_avatar(avatar2)
+
+    img = background.copy()
+    draw = ImageDraw.Draw(img)
+
+    img.paste(avatar1, (LEFT_X, Y_AVATAR), avatar1)
+    img.paste(avatar2, (RIGHT_X, Y_AVATAR), avatar2)
+
+    draw.text((LEFT_X + AVATAR_SIZE // 2, Y_AVATAR - 50),
+              name1, font=FONT_BIG, fill="white", anchor="mm")
+
+    draw.text((RIGHT_X + AVATAR_SIZE // 2, Y_AVATAR - 50),
+              name2, font=FONT_BIG, fill="white", anchor="mm")
+
+    fill_width = int(BAR_WIDTH * (compatibility / 100))
+
+    if compatibility <= 30:
+        bar_color = (180, 60, 60)
+    elif compatibility <= 70:
+        bar_color = (220, 50, 50)
+    else:
+        bar_color = (255, 40, 40)
+
+    if fill_width > 0:
+        draw.rounded_rectangle(
+            (BAR_X, BAR_Y, BAR_X + fill_width, BAR_Y + BAR_HEIGHT),
+            radius=25,
+            fill=bar_color
+        )
+
+    draw.text((WIDTH // 2, BAR_Y + BAR_HEIGHT + 60),
+              f"{compatibility}% Compatibility",
+              font=FONT_SMALL, fill="white", anchor="mm")
+
+    buffer = BytesIO()
+    img.save(buffer, "PNG")
+    buffer.seek(0)
+    return buffer
 
 
 class Ship(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
+        self.backgrounds = None
 
         self.quotes = [
             "The tides of Fontaine whisper your fate.",
@@ -27,13 +170,13 @@ class Ship(commands.Cog):
             "Judgment has been delivered."
         ]
 
-    async def cog_unload(self):
-        await self.session.close()
+    async def cog_load(self):
+        self.backgrounds = self.bot.loop.create_task(asyncio.to_thread(load_backgrounds))
 
-    async def fetch_avatar(self, url):
-        async with self.session.get(url) as resp:
-            data = await resp.read()
-        return Image.open(BytesIO(data)).convert("RGBA")
+    async def get_backgrounds(self):
+        # prepared once in the background at cog load; awaiting the finished
+        # task just returns the list
+        return await self.backgrounds
 
     @commands.hybrid_command(name="ship", description="Fontaine love compatibility")
     @app_commands.describe(user1="First user", user2="Second user")
@@ -53,102 +196,26 @@ class Ship(commands.Cog):
         else:
             loading = await ctx.send("The waters of Fontaine are calculating...")
 
-        avatar1 = await self.fetch_avatar(user1.display_avatar.url)
-        avatar2 = await self.fetch_avatar(user2.display_avatar.url)
-
-        size = 180
-        avatar1 = avatar1.resize((size, size))
-        avatar2 = avatar2.resize((size, size))
-
-        mask = Image.new("L", (size, size), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse((0, 0, size, size), fill=255)
-        avatar1.putalpha(mask)
-        avatar2.putalpha(mask)
-
-        width, height = 900, 520
-
-        backgrounds = [
-            os.path.join(ASSETS_PATH, f)
-            for f in os.listdir(ASSETS_PATH)
-            if f.lower().endswith(".jpg")
-        ]
+        backgrounds = await self.get_backgrounds()
 
         if not backgrounds:
             return await ctx.send("No background images found.")
 
-        bg = Image.open(random.choice(backgrounds)).convert("RGBA")
-        bg = bg.resize((width, height))
-        bg = bg.filter(ImageFilter.GaussianBlur(3))
-
-        overlay = Image.new("RGBA", (width, height), (0, 0, 0, 40))
-        bg = Image.alpha_composite(bg, overlay)
-
-        img = bg.copy()
-        draw = ImageDraw.Draw(img)
-
-        left_x = 180
-        right_x = width - 360
-        y_avatar = 150
-
-        img.paste(avatar1, (left_x, y_avatar), avatar1)
-        img.paste(avatar2, (right_x, y_avatar), avatar2)
-
-        try:
-            font_big = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 48)
-            font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 42)
-        except:
-            font_big = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-
-        draw.text((left_x + size // 2, y_avatar - 50),
-                  user1.display_name, font=font_big, fill="white", anchor="mm")
-
-        draw.text((right_x + size // 2, y_avatar - 50),
-                  user2.display_name, font=font_big, fill="white", anchor="mm")
-
-        # Heart
-        heart_x = width // 2
-        heart_y = y_avatar + 85
-
-        self.draw_real_heart(draw, heart_x, heart_y, 72, (255, 255, 255))
-        self.draw_real_heart(draw, heart_x, heart_y, 70, (255, 30, 30))
-
-        # Progress bar
-        bar_width = 600
-        bar_height = 35
-        bar_x = (width - bar_width) // 2
-        bar_y = 370
-
-        draw.rounded_rectangle(
-            (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
-            radius=25,
-            fill=(40, 40, 40)
+        size = (AVATAR_SIZE, AVATAR_SIZE)
+        avatar1, avatar2 = await asyncio.gather(
+            self.bot.avatars.get(user1.display_avatar, size),
+            self.bot.avatars.get(user2.display_avatar, size)
         )
 
-        fill_width = int(bar_width * (compatibility / 100))
-
-        if compatibility <= 30:
-            bar_color = (180, 60, 60)
-        elif compatibility <= 70:
-            bar_color = (220, 50, 50)
-        else:
-            bar_color = (255, 40, 40)
-
-        if fill_width > 0:
-            draw.rounded_rectangle(
-                (bar_x, bar_y, bar_x + fill_width, bar_y + bar_height),
-                radius=25,
-                fill=bar_color
-            )
-
-        draw.text((width // 2, bar_y + bar_height + 60),
-                  f"{compatibility}% Compatibility",
-                  font=font_small, fill="white", anchor="mm")
-
-        buffer = BytesIO()
-        img.save(buffer, "PNG")
-        buffer.seek(0)
+        buffer = await asyncio.to_thread(
+            render_ship,
+            random.choice(backgrounds),
+            avatar1,
+            avatar2,
+            user1.display_name,
+            user2.display_name,
+            compatibility
+        )
 
         file = discord.File(buffer, filename="ship.png")
 
@@ -194,20 +261,6 @@ class Ship(commands.Cog):
         else:
             await ctx.send("Something went wrong while calculating compatibility.")
 
-    def draw_real_heart(self, draw, x, y, size, color):
-        points = []
-        for t in range(0, 360):
-            angle = math.radians(t)
-            px = size * 16 * math.sin(angle) ** 3
-            py = -size * (
-                13 * math.cos(angle)
-                - 5 * math.cos(2 * angle)
-                - 2 * math.cos(3 * angle)
-                - math.cos(4 * angle)
-            )
-            points.append((x + px / 16, y + py / 16))
-        draw.polygon(points, fill=color)
-
 
 async def setup(bot):
     await bot.add_cog(Ship(bot))
\ No newline at end of file
@@ -1,15 +1,50 @@
 import discord
-from discord.ext import commands
-from collections import deque
+from discord.ext import commands, tasks
+from collections import deque, OrderedDict
+import aiosqlite
+import asyncio
+import heapq
 import json
+import os
+import re
+import time
+import traceback
 from datetime import datetime, timezone
 
+DB_PATH = "snipe.db"
+# pre-SQLite storage, imported into DB_PATH once and renamed
 SNIPE_FILE = "snipe.json"
 SETTINGS_FILE = "snipe_settings.json"
 
-
-def utcnow_iso():
-    return datetime.now(timezone.utc).isoformat()
+SNIPE_LIMIT = 10
+# deletions are batched and written this many seconds after the first one
+FLUSH_DELAY = 2
+# snipes older than this are never shown and get purged from disk
+SNIPE_TTL = 24 * 60 * 60
+# rough cap on the in-memory cache; least recently used channels are
+# dropped whole (they are still on disk and reload on the next snipe)
+MEMORY_BUDGET = 32 * 1024 * 1024
+# approximate fixed cost of one record before its strings, and of one
+# channel's deque and dict slot
+RECORD_OVERHEAD = 200
+CHANNEL_OVERHEAD = 700
+
+# opt-in per-guild archive of deleted and edited messages, searchable
+# with FTS5 and purged in small batches once past its retention
+DEFAULT_RETENTION_DAYS = 30
+MAX_RETENTION_DAYS = 365
+PURGE_BATCH = 500
+PURGE_BATCHES_PER_TICK = 20
+SEARCH_PAGE_SIZE = 5
+
+USER_MENTION = re.compile(r"^<@!?(\d+)>$")
+CHANNEL_MENTION = re.compile(r"^<#(\d+)>$")
+SINCE = re.compile(r"^since:(\d+)([mhdw])$", re.IGNORECASE)
+DURATION_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def iso(timestamp: float):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
 
 
 def parse_time(value: str):
@@ -22,17 +57,378 @@ def parse_time(value: str):
         return datetime.now(timezone.utc)
 
 
+def archive_row(message, kind: str, now: float):
+    return (
+        message.guild.id,
+        message.channel.id,
+        message.author.id,
+        message.author.name,
+        kind,
+        message.content,
+        json.dumps([a.url for a in message.attachments]),
+        now,
+    )
+
+
+def parse_search(query: str):
+    """Split `snipe search` input into FTS terms and the optional
+    user mention, channel mention and ``since:<n>[mhdw]`` filters. Anything
+    else, including bare tokens like ``3d``, is a search term."""
+    terms = []
+    author_id = channel_id = since = None
+
+    for token in query.split():
+        if m := USER_MENTION.match(token):
+            author_id = int(m.group(1))
+        elif m := CHANNEL_MENTION.match(token):
+            channel_id = int(m.group(1))
+        elif m := SINCE.match(token):
+            since = int(m.group(1)) * DURATION_UNITS[m.group(2).lower()]
+        else:
+            terms.append(token)
+
+    # quote every term so FTS5 operators in user input are taken literally
+    match = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+    return match, author_id, channel_id, since
+
+
+class SnipeRecord:
+    __slots__ = ("author_id", "author_name", "content", "attachments", "deleted_at")
+
+    def __init__(self, author_id, author_name, content, attachments, deleted_at):
+        self.author_id = author_id
+        self.author_name = author_name
+        self.content = content
+        self.attachments = attachments
+        self.deleted_at = deleted_at
+
+    @classmethod
+    def from_message(cls, message, deleted_at: float):
+        return cls(
+            message.author.id,
+            message.author.name,
+            message.content,
+            tuple(a.url for a in message.attachments),
+            deleted_at
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        author_id, author_name, content, attachments, deleted = row
+        return cls(
+            author_id,
+            author_name,
+            content,
+            tuple(json.loads(attachments)) if attachments else (),
+            parse_time(deleted).timestamp()
+        )
+
+    def row(self, channel_id):
+        return (
+            channel_id,
+            self.author_id,
+            self.author_name,
+            self.content,
+            json.dumps(self.attachments),
+            iso(self.deleted_at),
+        )
+
+    def size(self) -> int:
+        return (
+            RECORD_OVERHEAD
+            + len(self.content)
+            + len(self.author_name)
+            + sum(len(a) for a in self.attachments)
+        )
+
+
+class SnipeCache:
+    """Per-channel deques of records (newest first) in LRU order, bounded
+    by an approximate byte budget and a TTL."""
+
+    def __init__(self, budget: int = MEMORY_BUDGET, ttl: float = SNIPE_TTL):
+        self.budget = budget
+        self.ttl = ttl
+        self.channels = OrderedDict()
+        self.bytes = 0
+        self.records = 0
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self.channels),
+            "records": self.records,
+            "bytes": self.bytes,
+            "budget": self.budget,
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "expired": self.expired,
+        }
+
+    def get(self, channel_id, now: float):
+        saved = self.channels.get(channel_id)
+        if saved is None:
+            return None
+        self.channels.move_to_end(channel_id)
+        self.hits += 1
+        self._expire(saved, now - self.ttl)
+        return saved
+
+    def put(self, channel_id, records):
+        """Install a channel loaded from disk; records newest first."""
+        saved = deque(maxlen=SNIPE_LIMIT)
+        self.channels[channel_id] = saved
+        self.bytes += CHANNEL_OVERHEAD
+        self.loads += 1
+        for record in reversed(records):
+            self._push(saved, record)
+        self._evict()
+        return saved
+
+    def add(self, channel_id, record):
+        """Record a deletion in a channel that is already loaded."""
+        saved = self.channels.get(channel_id)
+        if saved is None:
+            return
+        self.channels.move_to_end(channel_id)
+        self._push(saved, record)
+        self._evict()
+
+    def sweep(self, now: float):
+        cutoff = now - self.ttl
+        for channel_id in list(self.channels):
+            saved = self.channels[channel_id]
+            self._expire(saved, cutoff)
+            if not saved:
+                del self.channels[channel_id]
+                self.bytes -= CHANNEL_OVERHEAD
+
+    def _push(self, saved, record):
+        if len(saved) == saved.maxlen:
+            self._drop(saved[-1])
+        saved.appendleft(record)
+        self.bytes += record.size()
+        self.records += 1
+
+    def _drop(self, record):
+        self.bytes -= record.size()
+        self.records -= 1
+
+    def _expire(self, saved, cutoff: float):
+        while saved and saved[-1].deleted_at < cutoff:
+            self._drop(saved.pop())
+            self.expired += 1
+
+    def _evict(self):
+        # never evict the channel just touched, even if it alone is over
+        while self.bytes > self.budget and len(self.channels) > 1:
+            _, saved = self.channels.popitem(last=False)
+            for record in saved:
+                self._drop(record)
+            self.bytes -= CHANNEL_OVERHEAD
+            self.evictions += 1
+
+
+class SnipeStore:
+    """Deleted messages in SQLite, newest SNIPE_LIMIT kept per channel."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = None
+        self.write_lock = asyncio.Lock()
+        self.fts = False
+
+    async def open(self):
+        self.db = await aiosqlite.connect(self.path)
+        await self.db.execute("PRAGMA journal_mode=WAL;")
+        await self.db.execute("PRAGMA busy_timeout = 5000;")
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS snipes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel_id INTEGER NOT NULL,
+                author_id INTEGER,
+                author_name TEXT,
+                content TEXT,
+                attachments TEXT,
+                time TEXT
+            )
+        """)
+        await self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_snipes_channel ON snipes(channel_id, id)"
+        )
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS archive_settings (
+                guild_id INTEGER PRIMARY KEY,
+                enabled INTEGER NOT NULL,
+                retention_days INTEGER NOT NULL
+            )
+        """)
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS archive (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                author_id INTEGER,
+                author_name TEXT,
+                kind TEXT,
+                content TEXT,
+                attachments TEXT,
+                created_at REAL NOT NULL
+            )
+        """)
+        await self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_archive_guild ON archive(guild_id, created_at)"
+        )
+
+        # external-content FTS5 index kept in step with archive by triggers;
+        # some SQLite builds ship without FTS5, in which case archiving is off
+        try:
+            await self.db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS archive_fts "
+                "USING fts5(content, content='archive', content_rowid='id')"
+            )
+            await self.db.execute("""
+                CREATE TRIGGER IF NOT EXISTS archive_ai AFTER INSERT ON archive BEGIN
+                    INSERT INTO archive_fts(rowid, content) VALUES (new.id, new.content);
+                END
+            """)
+            await self.db.execute("""
+                CREATE TRIGGER IF NOT EXISTS archive_ad AFTER DELETE ON archive BEGIN
+                    INSERT INTO archive_fts(archive_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                END
+            """)
+            self.fts = True
+        except aiosqlite.OperationalError:
+            self.fts = False
+
+        await self.db.commit()
+
+    async def close(self):
+        if self.db:
+            await self.db.close()
+            self.db = None
+
+    async def add_many(self, rows, archive_rows=(), limit: int = SNIPE_LIMIT):
+        """Insert rows (oldest first) and compact every channel they touch
+        down to its newest `limit`, all in one transaction together with
+        any archive rows."""
+        channels = {row[0] for row in rows}
+        async with self.write_lock:
+            if archive_rows:
+                await self.db.executemany(
+                    "INSERT INTO archive (guild_id, channel_id, author_id, author_name, kind, "
+                    "content, attachments, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    archive_rows
+                )
+            await self.db.executemany(
+                "INSERT INTO snipes (channel_id, author_id, author_name, content, attachments, time) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            await self.db.executemany(
+                "DELETE FROM snipes WHERE channel_id = ? AND id <= ("
+                "SELECT id FROM snipes WHERE channel_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                [(c, c, limit) for c in channels]
+            )
+            await self.db.commit()
+
+    async def recent(self, channel_id: int, since: float, limit: int = SNIPE_LIMIT) -> list:
+        """Newest first, none deleted before `since`."""
+        async with self.db.execute(
+            "SELECT author_id, author_name, content, attachments, time FROM snipes "
+            "WHERE channel_id = ? AND time >= ? ORDER BY id DESC LIMIT ?",
+            (channel_id, iso(since), limit)
+        ) as cursor:
+            return await cursor.fetchall()
+
+    async def purge(self, before: float) -> int:
+        async with self.write_lock:
+            cursor = await self.db.execute("DELETE FROM snipes WHERE time < ?", (iso(before),))
+            await self.db.commit()
+            return cursor.rowcount
+
+    # -------------------------
+    # ARCHIVE
+    # -------------------------
+    async def archive_settings(self) -> list:
+        async with self.db.execute(
+            "SELECT guild_id, enabled, retention_days FROM archive_settings"
+        ) as cursor:
+            return await cursor.fetchall()
+
+    async def set_archive(self, guild_id: int, enabled: bool, retention_days: int):
+        async with self.write_lock:
+            await self.db.execute(
+                "INSERT OR REPLACE INTO archive_settings VALUES (?, ?, ?)",
+                (guild_id, int(enabled), retention_days)
+            )
+            await self.db.commit()
+
+    async def drop_archive(self, guild_id: int):
+        async with self.write_lock:
+            await self.db.execute("DELETE FROM archive_settings WHERE guild_id = ?", (guild_id,))
+            await self.db.commit()
+
+    async def purge_archive(self, guild_id: int, before: float, limit: int = PURGE_BATCH) -> int:
+        """Delete up to `limit` of the guild's oldest rows created before
+        `before`; returns how many went."""
+        async with self.write_lock:
+            cursor = await self.db.execute(
+                "DELETE FROM archive WHERE id IN ("
+                "SELECT id FROM archive WHERE guild_id = ? AND created_at < ? LIMIT ?)",
+                (guild_id, before, limit)
+            )
+            await self.db.commit()
+            return cursor.rowcount
+
+    async def search(self, guild_id, match, author_id=None, channel_id=None, since=None,
+                     limit: int = SEARCH_PAGE_SIZE, offset: int = 0) -> list:
+        """Best matches first (FTS5 bm25 rank)."""
+        query = (
+            "SELECT a.channel_id, a.author_id, a.author_name, a.kind, a.content, "
+            "a.attachments, a.created_at FROM archive_fts "
+            "JOIN archive a ON a.id = archive_fts.rowid "
+            "WHERE archive_fts MATCH ? AND a.guild_id = ?"
+        )
+        params = [match, guild_id]
+
+        if author_id is not None:
+            query += " AND a.author_id = ?"
+            params.append(author_id)
+        if channel_id is not None:
+            query += " AND a.channel_id = ?"
+            params.append(channel_id)
+        if since is not None:
+            query += " AND a.created_at >= ?"
+            params.append(since)
+
+        query += " ORDER BY archive_fts.rank LIMIT ? OFFSET ?"
+        params += [limit, offset]
+
+        async with self.db.execute(query, params) as cursor:
+            return await cursor.fetchall()
+
+
 class Snipe(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-
-        # load deleted messages
-        try:
-            with open(SNIPE_FILE, "r") as f:
-                data = json.load(f)
-                self.snipes = {int(k): deque(v, maxlen=10) for k, v in data.items()}
-        except Exception:
-            self.snipes = {}
+        self.store = SnipeStore(DB_PATH)
+
+        # channels that were sniped recently, loaded from the store on demand
+        self.cache = SnipeCache()
+        # (channel_id, record) waiting to be written, oldest first
+        self.pending = []
+        # archive rows for opted-in guilds, written in the same flush
+        self.archive_pending = []
+        self.flush_lock = asyncio.Lock()
+        self.flush_task = None
+        # guild_id -> (enabled, retention_days)
+        self.archive = {}
 
         # load snipe role settings
         try:
@@ -41,14 +437,151 @@ class Snipe(commands.Cog):
         except Exception:
             self.settings = {}
 
-    def save_snipes(self):
-        with open(SNIPE_FILE, "w") as f:
-            json.dump({str(k): list(v) for k, v in self.snipes.items()}, f, indent=4)
+    async def cog_load(self):
+        await self.store.open()
+        await self.import_json()
+        for guild_id, enabled, days in await self.store.archive_settings():
+            self.archive[guild_id] = (bool(enabled), days)
+        self.expire_snipes.start()
+        self.purge_archive.start()
+
+    async def cog_unload(self):
+        self.expire_snipes.cancel()
+        self.purge_archive.cancel()
+        if self.flush_task and not self.flush_task.done():
+            self.flush_task.cancel()
+        await self.flush()
+        await self.store.close()
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "pending": len(self.pending)}
 
     def save_settings(self):
         with open(SETTINGS_FILE, "w") as f:
             json.dump(self.settings, f, indent=4)
 
+    # -------------------------
+    # STORAGE
+    # -------------------------
+    async def import_json(self):
+        if not os.path.exists(SNIPE_FILE):
+            return
+
+        def read():
+            with open(SNIPE_FILE, "r") as f:
+                return json.load(f)
+
+        try:
+            data = await asyncio.to_thread(read)
+        except Exception:
+            traceback.print_exc()
+            return
+
+        rows = []
+        for channel_id, records in data.items():
+            # stored newest first
+            for r in reversed(records):
+                record = SnipeRecord(
+                    r["author_id"], r["author_name"], r["content"],
+                    tuple(r["attachments"]), parse_time(r["time"]).timestamp()
+                )
+                rows.append(record.row(int(channel_id)))
+
+        if rows:
+            await self.store.add_many(rows)
+        os.replace(SNIPE_FILE, SNIPE_FILE + ".migrated")
+
+    def queue(self, channel_id, records):
+        """Remember records (oldest first) and schedule a write."""
+        for record in records:
+            self.cache.add(channel_id, record)
+            self.pending.append((channel_id, record))
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = self.bot.loop.create_task(self.flush_later())
+
+    def archiving(self, guild) -> bool:
+        return guild is not None and self.store.fts and self.archive.get(guild.id, (False,))[0]
+
+    def queue_archive(self, messages, kind: str):
+        now = time.time()
+        for message in messages:
+            if message.content or message.attachments:
+                self.archive_pending.append(archive_row(message, kind, now))
+        self.schedule_flush()
+
+    async def flush_later(self):
+        await asyncio.sleep(FLUSH_DELAY)
+        await asyncio.shield(self.flush())
+
+    async def flush(self):
+        async with self.flush_lock:
+            if not self.pending and not self.archive_pending:
+                return
+            pending, self.pending = self.pending, []
+            archived, self.archive_pending = self.archive_pending, []
+            try:
+                await self.store.add_many([r.row(c) for c, r in pending], archived)
+            except Exception:
+                traceback.print_exc()
+                self.pending[:0] = pending
+                self.archive_pending[:0] = archived
+
+    async def get_snipes(self, channel_id):
+        saved = self.cache.get(channel_id, time.time())
+        if saved is not None:
+            return saved
+
+        # holding flush_lock means nothing is half-written: every record is
+        # either in the database or still in self.pending
+        async with self.flush_lock:
+            now = time.time()
+            saved = self.cache.get(channel_id, now)
+            if saved is not None:
+                return saved
+
+            cutoff = now - SNIPE_TTL
+            records = [SnipeRecord.from_row(r) for r in await self.store.recent(channel_id, cutoff)]
+            for c, record in self.pending:
+                if c == channel_id and record.deleted_at >= cutoff:
+                    records.insert(0, record)
+            return self.cache.put(channel_id, records[:SNIPE_LIMIT])
+
+    @tasks.loop(minutes=30)
+    async def expire_snipes(self):
+        now = time.time()
+        self.cache.sweep(now)
+        try:
+            await self.store.purge(now - SNIPE_TTL)
+        except Exception:
+            traceback.print_exc()
+
+    @tasks.loop(minutes=10)
+    async def purge_archive(self):
+        """Trim each guild's archive to its retention a batch at a time,
+        yielding between batches; disabled guilds are emptied, then
+        forgotten."""
+        batches = 0
+        for guild_id, (enabled, days) in list(self.archive.items()):
+            before = time.time() - days * 86400 if enabled else float("inf")
+            while batches < PURGE_BATCHES_PER_TICK:
+                batches += 1
+                try:
+                    removed = await self.store.purge_archive(guild_id, before)
+                except Exception:
+                    traceback.print_exc()
+                    return
+                if removed < PURGE_BATCH:
+                    if not enabled and self.archive.get(guild_id, (True,))[0] is False:
+                        await self.store.drop_archive(guild_id)
+                        self.archive.pop(guild_id, None)
+                    break
+                await asyncio.sleep(0)
+            else:
+                return
+
     # -------------------------
     # LISTENER — save deleted msg
     # -------------------------
@@ -57,17 +590,34 @@ class Snipe(commands.Cog):
         if message.author.bot:
             return
 
-        saved = self.snipes.setdefault(message.channel.id, deque(maxlen=10))
+        self.queue(message.channel.id, [SnipeRecord.from_message(message, time.time())])
+
+        if self.archiving(message.guild):
+            self.queue_archive([message], "deleted")
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        """Purges and nukes arrive here rather than in on_message_delete.
+        Only the newest SNIPE_LIMIT are kept, so only those get a record."""
+        messages = [m for m in payload.cached_messages if not m.author.bot]
+        if not messages:
+            return
+
+        if self.archiving(messages[0].guild):
+            self.queue_archive(messages, "deleted")
 
-        saved.appendleft({
-            "author_id": message.author.id,
-            "author_name": message.author.name,
-            "content": message.content,
-            "attachments": [a.url for a in message.attachments],
-            "time": utcnow_iso()
-        })
+        newest = heapq.nlargest(SNIPE_LIMIT, messages, key=lambda m: m.id)
 
-        self.save_snipes()
+        newest.reverse()
+        now = time.time()
+        self.queue(payload.channel_id, [SnipeRecord.from_message(m, now) for m in newest])
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before, after):
+        if before.author.bot or before.content == after.content:
+            return
+        if self.archiving(before.guild):
+            self.queue_archive([before], "edited")
 
     # -------------------------
     # PERMISSION CHECK
@@ -82,13 +632,13 @@ class Snipe(commands.Cog):
     # -------------------------
     # SNIPE COMMAND
     # -------------------------
-    @commands.command(name="snipe")
+    @commands.group(name="snipe", invoke_without_command=True)
     @commands.cooldown(1, 5, commands.BucketType.channel)
     async def snipe(self, ctx, arg: str = None):
         if not self.has_snipe_permission(ctx):
             return await ctx.send("You do not have permission to use this command.")
 
-        messages = self.snipes.get(ctx.channel.id)
+        messages = await self.get_snipes(ctx.channel.id)
         if not messages:
             return await ctx.send("There is nothing to snipe.")
 
@@ -102,17 +652,16 @@ class Snipe(commands.Cog):
             )
 
             for idx, msg in enumerate(messages, start=1):
-                utc_time = parse_time(msg["time"])
-                timestamp = int(utc_time.timestamp())
-                content = msg["content"] or "[Attachment Only]"
+                timestamp = int(msg.deleted_at)
+                content = msg.content or "[Attachment Only]"
 
                 value = (
-                    f"Author: <@{msg['author_id']}>\n"
+                    f"Author: <@{msg.author_id}>\n"
                     f"Content: {content}\n"
                 )
 
-                if msg["attachments"]:
-                    for i, att in enumerate(msg["attachments"], start=1):
+                if msg.attachments:
+                    for i, att in enumerate(msg.attachments, start=1):
                         value += f"Attachment {i}: {att}\n"
 
                 embed.add_field(
@@ -132,10 +681,10 @@ class Snipe(commands.Cog):
     # SINGLE SNIPE EMBED
     # -------------------------
     async def send_single_snipe(self, ctx, msg):
-        member = ctx.guild.get_member(msg["author_id"])
+        member = ctx.guild.get_member(msg.author_id)
 
         embed = discord.Embed(
-            description=msg["content"] or "[Attachment Only]",
+            description=msg.content or "[Attachment Only]",
             color=discord.Color.blue()
         )
 
@@ -145,12 +694,12 @@ class Snipe(commands.Cog):
                 icon_url=member.display_avatar.url
             )
         else:
-            embed.set_author(name=msg["author_name"])
+            embed.set_author(name=msg.author_name)
 
-        embed.timestamp = parse_time(msg["time"])
+        embed.timestamp = datetime.fromtimestamp(msg.deleted_at, timezone.utc)
 
-        if msg["attachments"]:
-            for i, att in enumerate(msg["attachments"], start=1):
+        if msg.attachments:
+            for i, att in enumerate(msg.attachments, start=1):
                 embed.add_field(
                     name=f"Attachment {i}",
                     value=att,
@@ -159,6 +708,71 @@ class Snipe(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    # -------------------------
+    # ARCHIVE SEARCH
+    # -------------------------
+    @snipe.command(name="search")
+    @commands.guild_only()
+    @commands.has_permissions(manage_messages=True)
+    async def snipe_search(self, ctx, *, query: str):
+        """snipe search <terms> [@user] [#channel] [since:7d]"""
+        if not self.has_snipe_permission(ctx):
+            return await ctx.send("You do not have permission to use this command.")
+        if not self.store.fts:
+            return await ctx.send("Message search isn't available on this bot.")
+        if not self.archive.get(ctx.guild.id, (False,))[0]:
+            return await ctx.send("The message archive is off. An admin can enable it with `snipe archive on`.")
+
+        match, author_id, channel_id, since = parse_search(query)
+        if not match:
+            return await ctx.send("Give at least one word to search for.")
+
+        # make anything still waiting in the write buffer searchable
+        await self.flush()
+
+        search = SearchView(
+            self, ctx.author, ctx.guild.id, match, author_id, channel_id,
+            time.time() - since if since else None
+        )
+        embed = await search.render()
+        search.message = await ctx.send(embed=embed, view=search)
+
+    @snipe.command(name="archive")
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def snipe_archive(self, ctx, setting: str = None, days: int = DEFAULT_RETENTION_DAYS):
+        """snipe archive [on [days] | off]"""
+        if not self.store.fts:
+            return await ctx.send("Message search isn't available on this bot.")
+
+        enabled, current = self.archive.get(ctx.guild.id, (False, DEFAULT_RETENTION_DAYS))
+
+        if setting is None:
+            if enabled:
+                return await ctx.send(f"Archive is on, keeping messages for {current} days.")
+            return await ctx.send("Archive is off. Use `snipe archive on [days]` to enable it.")
+
+        setting = setting.lower()
+        if setting == "on":
+            if not 1 <= days <= MAX_RETENTION_DAYS:
+                return await ctx.send(f"Retention must be between 1 and {MAX_RETENTION_DAYS} days.")
+            await self.store.set_archive(ctx.guild.id, True, days)
+            self.archive[ctx.guild.id] = (True, days)
+            return await ctx.send(
+                f"Archiving deleted and edited messages for {days} days. "
+                "Search with `snipe search <terms>`."
+            )
+
+        if setting == "off":
+            if not enabled:
+                return await ctx.send("Archive is already off.")
+            # rows are removed gradually by purge_archive
+            await self.store.set_archive(ctx.guild.id, False, current)
+            self.archive[ctx.guild.id] = (False, current)
+            return await ctx.send("Archive turned off. Stored messages will be deleted shortly.")
+
+        await ctx.send("Use `snipe archive on [days]` or `snipe archive off`.")
+
     # -------------------------
     # SETTINGS
     # -------------------------
@@ -212,5 +826,83 @@ class Snipe(commands.Cog):
             )
 
 
+class SearchView(discord.ui.View):
+    def __init__(self, cog, author, guild_id, match, author_id, channel_id, since):
+        super().__init__(timeout=180)
+        self.cog = cog
+        self.author = author
+        self.query = (guild_id, match, author_id, channel_id, since)
+        self.page = 0
+        self.message = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author.id:
+            await interaction.response.send_message(
+                "Only the command user can use these buttons.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+    async def on_timeout(self):
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+    async def render(self):
+        # one extra row tells us whether there's a next page
+        rows = await self.cog.store.search(
+            *self.query,
+            limit=SEARCH_PAGE_SIZE + 1,
+            offset=self.page * SEARCH_PAGE_SIZE
+        )
+        has_next = len(rows) > SEARCH_PAGE_SIZE
+        rows = rows[:SEARCH_PAGE_SIZE]
+
+        self.previous.disabled = self.page == 0
+        self.next.disabled = not has_next
+
+        embed = discord.Embed(
+            title="Message Archive Search",
+            color=discord.Color.blue()
+        )
+
+        if not rows:
+            embed.description = "No matching messages."
+
+        start = self.page * SEARCH_PAGE_SIZE
+        for idx, (channel_id, author_id, author_name, kind, content, attachments, created_at) in enumerate(rows, start=start + 1):
+            content = content or "[Attachment Only]"
+            if len(content) > 300:
+                content = content[:297] + "..."
+
+            value = f"Author: <@{author_id}> ({author_name})\nChannel: <#{channel_id}>\n{content}"
+            for i, att in enumerate(json.loads(attachments or "[]"), start=1):
+                value += f"\nAttachment {i}: {att}"
+
+            embed.add_field(
+                name=f"{idx}. {kind.capitalize()} <t:{int(created_at)}:R>",
+                value=value[:1024],
+                inline=False
+            )
+
+        embed.set_footer(text=f"Page {self.page + 1}")
+        return embed
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.gray)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        embed = await self.render()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.gray)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        embed = await self.render()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+
 async def setup(bot):
     await bot.add_cog(Snipe(bot))
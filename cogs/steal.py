@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord.ui import View, Button
-import aiohttp
 from io import BytesIO
 import re
 
@@ -57,9 +56,9 @@ class Steal(commands.Cog):
                         await interaction.followup.send(f"⚠️ Failed to add emoji:\n```{e}```")
 
                 async def get_bytes(self, url):
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url) as resp:
-                            return await resp.read()
+                    session = ctx.bot.http_client
+                    async with session.get(url) as resp:
+                        return await resp.read()
 
             # Button: Add as Sticker
             class AddSticker(Button):
@@ -82,9 +81,9 @@ class Steal(commands.Cog):
                         await interaction.followup.send(f"⚠️ Failed to add sticker:\n```{e}```")
 
                 async def get_bytes(self, url):
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url) as resp:
-                            return await resp.read()
+                    session = ctx.bot.http_client
+                    async with session.get(url) as resp:
+                        return await resp.read()
 
             view.add_item(AddEmoji())
             view.add_item(AddSticker())
@@ -93,9 +92,9 @@ class Steal(commands.Cog):
         if emoji:
             ext = "gif" if emoji["animated"] else "png"
             url = f"https://cdn.discordapp.com/emojis/{emoji['id']}.{ext}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    data = await resp.read()
+            session = self.bot.http_client
+            async with session.get(url) as resp:
+                data = await resp.read()
             try:
                 new_emoji = await ctx.guild.create_custom_emoji(
                     name=emoji["name"],
@@ -106,9 +105,9 @@ class Steal(commands.Cog):
                 await ctx.reply(f"⚠️ Failed to add emoji:\n```{e}```")
 
     async def get_file_from_url(self, url):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                data = await resp.read()
+        session = self.bot.http_client
+        async with session.get(url) as resp:
+            data = await resp.read()
         return discord.File(BytesIO(data), filename="sticker.png")
 
 
@@ -112,6 +112,44 @@ class Utility(commands.Cog):
 
         await ctx.reply(embed=embed, mention_author=False)
 
+    def cache_summary(self):
+        lines = []
+
+        snipe = self.bot.get_cog("Snipe")
+        if snipe:
+            s = snipe.stats()
+            lines.append(
+                f"Snipe: {s['records']} msgs in {s['channels']} channels, "
+                f"{s['bytes'] // 1024}/{s['budget'] // 1024} KiB, "
+                f"{s['evictions']} evicted, {s['expired']} expired"
+            )
+
+        avatars = getattr(self.bot, "avatars", None)
+        if avatars:
+            a = avatars.stats()
+            lines.append(
+                f"Avatars: {a['entries']} cached, {a['bytes'] // 1024} KiB, "
+                f"{a['hit_rate']:.0%} hits, {a['evictions']} evicted"
+            )
+
+        if self.bot.get_cog("ChessCog"):
+            r = self.bot.manager.renderer.stats()
+            lookups = r["hits"] + r["misses"]
+            hit_rate = r["hits"] / lookups if lookups else 0
+            lines.append(
+                f"Chess boards: {r['cached']} cached, {hit_rate:.0%} hits, "
+                f"{r['misses']} rendered on {r['workers']} workers"
+            )
+
+        http_client = getattr(self.bot, "http_client", None)
+        if http_client:
+            hosts = http_client.stats()
+            requests = sum(h["requests"] for h in hosts.values())
+            errors = sum(h["errors"] for h in hosts.values())
+            lines.append(f"HTTP: {requests} requests, {errors} errors, {len(hosts)} hosts")
+
+        return "\n".join(lines)
+
     @commands.command(name="botinfo")
     async def botinfo(self, ctx):
         cpu = psutil.cpu_percent()
@@ -143,6 +181,10 @@ class Utility(commands.Cog):
             inline=True
         )
 
+        caches = self.cache_summary()
+        if caches:
+            embed.add_field(name="Caches", value=caches, inline=False)
+
         embed.set_footer(text=f"Uptime: {uptime}")
 
         await ctx.reply(embed=embed, mention_author=False)
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-import aiohttp
+from utils.prefetch import PrefetchBuffer
 
 
 class Waifu(commands.Cog):
@@ -8,10 +8,19 @@ class Waifu(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
+        self.session = bot.http_client
+        self.buffers = {
+            category: PrefetchBuffer(lambda c=category: self.fetch_batch(c))
+            for category in self.CATEGORIES
+        }
+
+    async def cog_load(self):
+        for buffer in self.buffers.values():
+            buffer.warm()
 
     async def cog_unload(self):
-        await self.session.close()
+        for buffer in self.buffers.values():
+            buffer.close()
 
     async def fetch_image(self, category: str):
         async with self.session.get(f"https://api.waifu.pics/sfw/{category}") as resp:
@@ -20,6 +29,13 @@ class Waifu(commands.Cog):
             data = await resp.json()
             return data.get("url")
 
+    async def fetch_batch(self, category: str):
+        url = await self.fetch_image(category)
+        return [url] if url else None
+
+    async def next_image(self, category: str):
+        return await self.buffers[category].get()
+
     def build_embed(self, image_url, category, author):
         embed = discord.Embed(
             title=f"Random {category.title()}",
@@ -37,7 +53,7 @@ class Waifu(commands.Cog):
     async def waifu(self, ctx: commands.Context):
         category_index = 0
         category = self.CATEGORIES[category_index]
-        image_url = await self.fetch_image(category)
+        image_url = await self.next_image(category)
 
         if not image_url:
             return await ctx.send("Could not fetch a safe image.")
@@ -67,7 +83,7 @@ class WaifuView(discord.ui.View):
         await interaction.response.defer()
 
         category = self.cog.CATEGORIES[self.category_index]
-        image_url = await self.cog.fetch_image(category)
+        image_url = await self.cog.next_image(category)
         if not image_url:
             return
 
@@ -92,7 +108,7 @@ class WaifuView(discord.ui.View):
 
         self.category_index = (self.category_index + 1) % len(self.cog.CATEGORIES)
         category = self.cog.CATEGORIES[self.category_index]
-        image_url = await self.cog.fetch_image(category)
+        image_url = await self.cog.next_image(category)
         if not image_url:
             return
 
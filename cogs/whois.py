@@ -3,19 +3,28 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import LayoutView, Container, Separator, TextDisplay
 import aiohttp
+import asyncio
 import ssl
 import socket
+import time
 from datetime import datetime, timezone
 
+BOOTSTRAP_URL = "https://data.iana.org/rdap/dns.json"
+BOOTSTRAP_TTL = 24 * 60 * 60
+RESULT_TTL = 10 * 60
+RESULT_CACHE_SIZE = 256
+PROBE_TIMEOUT = 5
+
 
 class Whois(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
-        self.bootstrap_cache = None
-
-    async def cog_unload(self):
-        await self.session.close()
+        self.session = bot.http_client
+        self.rdap_servers = {}
+        self.rdap_expires = 0.0
+        self.bootstrap_lock = asyncio.Lock()
+        self.ssl_context = ssl.create_default_context()
+        self.results = {}
 
     async def fetch_json(self, url):
         try:
@@ -29,29 +38,37 @@ class Whois(commands.Cog):
         except:
             return None
 
-    async def get_bootstrap(self):
-        if self.bootstrap_cache:
-            return self.bootstrap_cache
+    async def get_rdap_servers(self):
+        if time.monotonic() < self.rdap_expires:
+            return self.rdap_servers
 
-        data = await self.fetch_json("https://data.iana.org/rdap/dns.json")
-        if data:
-            self.bootstrap_cache = data
-        return data
+        async with self.bootstrap_lock:
+            # another lookup may have refreshed it while we waited
+            if time.monotonic() < self.rdap_expires:
+                return self.rdap_servers
 
-    async def fetch_rdap(self, domain):
-        tld = domain.split(".")[-1]
-        bootstrap = await self.get_bootstrap()
-        if not bootstrap:
-            return None
+            data = await self.fetch_json(BOOTSTRAP_URL)
+            if data:
+                servers = {}
+                for tlds, urls in data.get("services", []):
+                    if not urls:
+                        continue
+                    for tld in tlds:
+                        servers[tld.lower()] = urls[0]
+                self.rdap_servers = servers
+                self.rdap_expires = time.monotonic() + BOOTSTRAP_TTL
 
-        rdap_url = None
-        for entry in bootstrap.get("services", []):
-            if tld in entry[0]:
-                rdap_url = entry[1][0]
-                break
+        return self.rdap_servers
 
+    async def fetch_rdap(self, domain):
+        tld = domain.rsplit(".", 1)[-1]
+        servers = await self.get_rdap_servers()
+
+        rdap_url = servers.get(tld)
         if not rdap_url:
             return None
+        if not rdap_url.endswith("/"):
+            rdap_url += "/"
 
         return await self.fetch_json(f"{rdap_url}domain/{domain}")
 
@@ -71,10 +88,22 @@ class Whois(commands.Cog):
 
     async def get_ssl_info(self, domain):
         try:
-            context = ssl.create_default_context()
-            with socket.create_connection((domain, 443), timeout=5) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    domain, 443,
+                    ssl=self.ssl_context,
+                    server_hostname=domain
+                ),
+                timeout=PROBE_TIMEOUT
+            )
+            try:
+                cert = writer.get_extra_info("peercert")
+            finally:
+                writer.close()
+                try:
+                    await asyncio.wait_for(writer.wait_closed(), timeout=PROBE_TIMEOUT)
+                except Exception:
+                    pass
 
             issuer = dict(x[0] for x in cert["issuer"]).get("organizationName", "Unknown")
             expiry_raw = cert["notAfter"]
@@ -87,10 +116,47 @@ class Whois(commands.Cog):
 
     async def resolve_ip(self, domain):
         try:
-            return socket.gethostbyname(domain)
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(
+                    domain, None,
+                    family=socket.AF_INET,
+                    type=socket.SOCK_STREAM
+                ),
+                timeout=PROBE_TIMEOUT
+            )
+            return infos[0][4][0] if infos else None
         except:
             return None
 
+    async def lookup(self, domain):
+        """RDAP record, SSL info and IP for a domain, fetched concurrently
+        and cached for RESULT_TTL seconds."""
+        # example.com, Example.COM and example.com. are the same lookup
+        domain = domain.lower().rstrip(".")
+        now = time.monotonic()
+        cached = self.results.get(domain)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        data, ssl_info, ip_address = await asyncio.gather(
+            self.fetch_rdap(domain),
+            self.get_ssl_info(domain),
+            self.resolve_ip(domain)
+        )
+        result = (data, ssl_info, ip_address)
+
+        # only cache answers worth keeping; a failed RDAP lookup is retried
+        if data:
+            if len(self.results) >= RESULT_CACHE_SIZE:
+                self.results = {
+                    k: v for k, v in self.results.items() if v[0] > now
+                }
+                while len(self.results) >= RESULT_CACHE_SIZE:
+                    self.results.pop(next(iter(self.results)))
+            self.results[domain] = (now + RESULT_TTL, result)
+
+        return result
+
     @app_commands.command(name="whois", description="Advanced domain lookup")
     async def whois(self, interaction: discord.Interaction, domain: str):
         await interaction.response.defer(thinking=True)
@@ -100,7 +166,7 @@ class Whois(commands.Cog):
             if domain.startswith("http"):
                 domain = domain.split("//")[-1].split("/")[0]
 
-            data = await self.fetch_rdap(domain)
+            data, ssl_info, ip_address = await self.lookup(domain)
             if not data:
                 return await interaction.followup.send(
                     "Domain not found or RDAP not supported."
@@ -127,8 +193,7 @@ class Whois(commands.Cog):
 
             age_days = self.calculate_age_days(created_dt)
 
-            ssl_issuer, ssl_expiry, ssl_days = await self.get_ssl_info(domain)
-            ip_address = await self.resolve_ip(domain)
+            ssl_issuer, ssl_expiry, ssl_days = ssl_info
 
             view = LayoutView()
             container = Container()
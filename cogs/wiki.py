@@ -1,11 +1,21 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
+import asyncio
 import math
+import time
+import urllib.parse
 
-USER_AGENT = "DiscordBot/1.0 (+https://discord.com)"
 MAX_GALLERY = 3
+API_URL = "https://en.wikipedia.org/w/api.php"
+REST_URL = "https://en.wikipedia.org/api/rest_v1/page"
+CACHE_TTL = 15 * 60
+CACHE_SIZE = 256
+RELATED_TOPICS = 5
+
+
+class WikiError(Exception):
+    """A lookup failed; the message is shown to the user as-is."""
 
 class RelatedTopicButton(discord.ui.Button):
     def __init__(self, label: str, topic: str):
@@ -19,34 +29,123 @@ class RelatedTopicButton(discord.ui.Button):
 class WikipediaCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # key -> (expires, task); tasks double as the in-flight marker so a
+        # click and a background prefetch for the same page share one fetch
+        self.searches = {}
+        self.pages = {}
+        self.prefetches = set()
+
+    # -------------------------
+    # Cache
+    # -------------------------
+
+    def cached(self, cache, key, factory):
+        now = time.monotonic()
+        entry = cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        if len(cache) >= CACHE_SIZE:
+            for k in [k for k, v in cache.items() if v[0] <= now]:
+                del cache[k]
+            while len(cache) >= CACHE_SIZE:
+                cache.pop(next(iter(cache)))
+
+        task = asyncio.ensure_future(factory())
+        cache[key] = (now + CACHE_TTL, task)
+
+        def forget_failure(t):
+            if t.cancelled() or t.exception() is not None:
+                if cache.get(key, (None, None))[1] is t:
+                    del cache[key]
+
+        task.add_done_callback(forget_failure)
+        return task
+
+    # -------------------------
+    # Wikipedia API
+    # -------------------------
+
+    async def fetch_search(self, query):
+        async with self.bot.http_client.get(
+            API_URL,
+            params={
+                "action": "query",
+                "list": "search",
+                "srsearch": query,
+                "format": "json"
+            }
+        ) as r:
+            if r.status != 200:
+                raise WikiError(f"Search failed (HTTP {r.status}).")
+            try:
+                search_data = await r.json()
+            except Exception:
+                raise WikiError("Wikipedia returned an invalid response.")
+
+        return search_data.get("query", {}).get("search", [])
+
+    async def fetch_summary(self, path):
+        async with self.bot.http_client.get(f"{REST_URL}/summary/{path}") as r:
+            if r.status != 200:
+                raise WikiError(f"Summary lookup failed (HTTP {r.status}).")
+            try:
+                return await r.json()
+            except Exception:
+                raise WikiError("Invalid summary response.")
+
+    async def fetch_media(self, path):
+        try:
+            async with self.bot.http_client.get(f"{REST_URL}/media-list/{path}") as r:
+                return await r.json() if r.status == 200 else {}
+        except Exception:
+            return {}
+
+    async def fetch_page(self, title):
+        path = urllib.parse.quote(title.replace(" ", "_"), safe="")
+        return await asyncio.gather(
+            self.fetch_summary(path),
+            self.fetch_media(path)
+        )
+
+    async def search_results(self, query):
+        key = query.strip().lower()
+        return await asyncio.shield(
+            self.cached(self.searches, key, lambda: self.fetch_search(query))
+        )
+
+    async def page(self, title):
+        return await asyncio.shield(
+            self.cached(self.pages, title, lambda: self.fetch_page(title))
+        )
+
+    async def prefetch(self, topics):
+        async def warm(topic):
+            try:
+                results = await self.search_results(topic)
+                if results:
+                    await self.page(results[0]["title"])
+            except Exception:
+                pass
+
+        await asyncio.gather(*(warm(t) for t in topics))
+
+    def start_prefetch(self, topics):
+        task = self.bot.loop.create_task(self.prefetch(topics))
+        self.prefetches.add(task)
+        task.add_done_callback(self.prefetches.discard)
+
+    async def cog_unload(self):
+        for task in self.prefetches:
+            task.cancel()
+
+    # -------------------------
+    # Command
+    # -------------------------
 
     async def perform_search(self, interaction: discord.Interaction, query: str):
-        headers = {"User-Agent": USER_AGENT}
-
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(
-                "https://en.wikipedia.org/w/api.php",
-                params={
-                    "action": "query",
-                    "list": "search",
-                    "srsearch": query,
-                    "format": "json"
-                }
-            ) as r:
-                if r.status != 200:
-                    return await interaction.followup.send(
-                        f"Search failed (HTTP {r.status}).",
-                        ephemeral=True
-                    )
-                try:
-                    search_data = await r.json()
-                except Exception:
-                    return await interaction.followup.send(
-                        "Wikipedia returned an invalid response.",
-                        ephemeral=True
-                    )
-
-            results = search_data.get("query", {}).get("search", [])
+        try:
+            results = await self.search_results(query)
             if not results:
                 return await interaction.followup.send(
                     "No results found.",
@@ -54,27 +153,9 @@ class WikipediaCog(commands.Cog):
                 )
 
             page_title = results[0]["title"]
-
-            async with session.get(
-                f"https://en.wikipedia.org/api/rest_v1/page/summary/{page_title}"
-            ) as r:
-                if r.status != 200:
-                    return await interaction.followup.send(
-                        f"Summary lookup failed (HTTP {r.status}).",
-                        ephemeral=True
-                    )
-                try:
-                    summary = await r.json()
-                except Exception:
-                    return await interaction.followup.send(
-                        "Invalid summary response.",
-                        ephemeral=True
-                    )
-
-            async with session.get(
-                f"https://en.wikipedia.org/api/rest_v1/page/media-list/{page_title}"
-            ) as r:
-                media_data = await r.json() if r.status == 200 else {}
+            summary, media_data = await self.page(page_title)
+        except WikiError as e:
+            return await interaction.followup.send(str(e), ephemeral=True)
 
         extract = summary.get("extract", "")
         short_desc = summary.get("description", "")
@@ -121,11 +202,16 @@ class WikipediaCog(commands.Cog):
             view = discord.ui.View()
             view.cog = self
 
-            for item in results[1:6]:
+            topics = []
+            for item in results[1:1 + RELATED_TOPICS]:
                 topic = item.get("title")
                 if topic:
+                    topics.append(topic)
                     view.add_item(RelatedTopicButton(label=topic, topic=topic))
 
+            if topics:
+                self.start_prefetch(topics)
+
             if page_url:
                 view.add_item(discord.ui.Button(label="Open on Wikipedia", url=page_url))
 
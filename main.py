@@ -1,25 +1,25 @@
 import discord
 from discord.ext import commands
 import asyncio
-import json
-import os
+from utils.prefix_store import PrefixStore, DEFAULT_PREFIX
+from utils.message_router import MessageRouter
+from utils.avatar_cache import AvatarCache
+from utils.http_client import HttpClient
 
 PREFIX_FILE = "prefixes.json"
 
-if not os.path.exists(PREFIX_FILE):
-    with open(PREFIX_FILE, "w") as f:
-        json.dump({}, f)
-
 def get_prefix(bot, message):
     """Fetch prefix for each server."""
     if not message.guild:
-        return ","
-    with open(PREFIX_FILE, "r") as f:
-        prefixes = json.load(f)
-    return prefixes.get(str(message.guild.id), ",")
+        return DEFAULT_PREFIX
+    return bot.prefixes.get(message.guild.id)
 
 intents = discord.Intents.all()
 bot = commands.Bot(command_prefix=get_prefix, intents=intents)
+bot.prefixes = PrefixStore(PREFIX_FILE)
+bot.router = MessageRouter(bot)
+bot.avatars = AvatarCache()
+bot.http_client = HttpClient()
 
 async def load_cogs():
     extensions = [
@@ -85,10 +85,17 @@ async def on_ready():
     print(f"✅ Synced slash commands for {bot.user}")
     print(f"Furina is online — {bot.user} (ID: {bot.user.id})")
 
+@bot.event
+async def on_message(message):
+    await bot.router.dispatch(message)
+
 async def main():
     async with bot:
         await load_cogs()
-        await bot.start("YOUR_TOKEN_HERE")
+        try:
+            await bot.start("YOUR_TOKEN_HERE")
+        finally:
+            await bot.http_client.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,104 @@
+import asyncio
+from collections import OrderedDict
+from io import BytesIO
+
+from PIL import Image
+
+# Discord serves avatars at power-of-two sizes up to 4096; fetch the
+# smallest one that covers the requested size, but never more than the
+# 1024px that Asset.url hands out by default.
+CDN_SIZES = (16, 32, 64, 128, 256, 512, 1024)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def cdn_size(size: tuple) -> int:
+    need = max(size)
+    for s in CDN_SIZES:
+        if s >= need:
+            return s
+    return CDN_SIZES[-1]
+
+
+def decode(data: bytes, size: tuple) -> Image.Image:
+    img = Image.open(BytesIO(data)).convert("RGBA")
+    if img.size != size:
+        img = img.resize(size)
+    img.load()
+    return img
+
+
+class AvatarCache:
+    """Bot-wide LRU of decoded, resized avatars.
+
+    Entries are keyed by the asset hash and the requested size, so a user
+    changing their avatar naturally misses. Images are shared between
+    callers and must be treated as read-only (copy before putalpha etc.).
+    Concurrent requests for the same key share one download and decode.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    async def get(self, asset, size: tuple) -> Image.Image:
+        key = (asset.key, size)
+
+        img = self.entries.get(key)
+        if img is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return img
+
+        fut = self.pending.get(key)
+        if fut is not None:
+            self.hits += 1
+            return await asyncio.shield(fut)
+
+        self.misses += 1
+        fut = asyncio.get_running_loop().create_task(self._load(asset, size))
+        self.pending[key] = fut
+        try:
+            img = await asyncio.shield(fut)
+        finally:
+            self.pending.pop(key, None)
+
+        self._store(key, img)
+        return img
+
+    async def _load(self, asset, size: tuple) -> Image.Image:
+        data = await asset.with_size(cdn_size(size)).read()
+        return await asyncio.to_thread(decode, data, size)
+
+    def _store(self, key, img: Image.Image):
+        if key in self.entries:
+            return
+
+        cost = img.width * img.height * len(img.getbands())
+        if cost > self.max_bytes:
+            return
+
+        self.entries[key] = img
+        self.bytes += cost
+
+        while self.bytes > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.width * old.height * len(old.getbands())
+            self.evictions += 1
@@ -0,0 +1,115 @@
+import time
+from collections import OrderedDict
+
+import aiohttp
+
+# Connection pool and timeout defaults for every outbound request the bot
+# makes outside discord.py's own HTTP client.
+TOTAL_CONNECTIONS = 100
+CONNECTIONS_PER_HOST = 10
+DNS_CACHE_SECONDS = 300
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+USER_AGENT = "FurinaBot/1.0 (+https://github.com/Furina67/furina)"
+# per-host stats are kept for the most recently used hosts only, since
+# commands like whois fetch whatever host a user pastes
+MAX_TRACKED_HOSTS = 256
+
+
+class HostStats:
+    __slots__ = ("requests", "responses", "errors", "total_latency", "max_latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.responses = 0
+        # failed connections / timeouts plus responses with status >= 400
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self) -> dict:
+        done = self.responses
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(self.total_latency / done * 1000, 1) if done else 0.0,
+            "max_ms": round(self.max_latency * 1000, 1),
+        }
+
+
+class HttpClient:
+    """One pooled aiohttp session shared by every cog.
+
+    The session is created on first use (inside the running loop) and keeps
+    connections, DNS lookups and TLS sessions alive between requests.
+    get/post/request mirror aiohttp.ClientSession, so call sites stay
+    ``async with bot.http_client.get(url) as resp``.
+    """
+
+    def __init__(self):
+        self._session = None
+        self.hosts = OrderedDict()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(self._on_request_start)
+            trace.on_request_end.append(self._on_request_end)
+            trace.on_request_exception.append(self._on_request_exception)
+
+            connector = aiohttp.TCPConnector(
+                limit=TOTAL_CONNECTIONS,
+                limit_per_host=CONNECTIONS_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_SECONDS,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=DEFAULT_TIMEOUT,
+                headers={"User-Agent": USER_AGENT},
+                trace_configs=[trace],
+            )
+        return self._session
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.session.post(url, **kwargs)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def stats(self) -> dict:
+        return {host: s.as_dict() for host, s in self.hosts.items()}
+
+    def _host(self, host) -> HostStats:
+        s = self.hosts.get(host)
+        if s is None:
+            s = self.hosts[host] = HostStats()
+            if len(self.hosts) > MAX_TRACKED_HOSTS:
+                self.hosts.popitem(last=False)
+        else:
+            self.hosts.move_to_end(host)
+        return s
+
+    async def _on_request_start(self, session, ctx, params):
+        ctx.start = time.perf_counter()
+        self._host(params.url.host).requests += 1
+
+    async def _on_request_end(self, session, ctx, params):
+        elapsed = time.perf_counter() - ctx.start
+        s = self._host(params.url.host)
+        s.responses += 1
+        s.total_latency += elapsed
+        if elapsed > s.max_latency:
+            s.max_latency = elapsed
+        if params.response.status >= 400:
+            s.errors += 1
+
+    async def _on_request_exception(self, session, ctx, params):
+        self._host(params.url.host).errors += 1
@@ -0,0 +1,132 @@
+from collections import deque
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+HASH_SIZE = 8
+
+
+def dhash(data: bytes, size: int = HASH_SIZE) -> int:
+    """Difference hash of an encoded image: size*size bits, one per
+    horizontally adjacent pixel pair of a (size+1)x(size) grayscale
+    thumbnail. Blocking; run it in a worker thread."""
+    img = Image.open(BytesIO(data))
+    # let JPEG decode at a fraction of full resolution
+    img.draft("L", (size * 4, size * 4))
+    img = img.convert("L").resize((size + 1, size), Image.LANCZOS)
+
+    px = np.asarray(img, dtype=np.int16)
+    bits = px[:, 1:] > px[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes with Hamming distance.
+
+    Nodes are ``[hash, count, children]`` lists; removing a hash only
+    decrements its count, and ``dead`` tracks how many nodes are empty so the
+    owner can rebuild when they start to dominate.
+    """
+
+    __slots__ = ("root", "dead")
+
+    def __init__(self, hashes=()):
+        self.root = None
+        self.dead = 0
+        for h in hashes:
+            self.add(h)
+
+    def add(self, h: int):
+        if self.root is None:
+            self.root = [h, 1, {}]
+            return
+
+        node = self.root
+        while True:
+            d = hamming(h, node[0])
+            if d == 0:
+                if node[1] == 0:
+                    self.dead -= 1
+                node[1] += 1
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [h, 1, {}]
+                return
+            node = child
+
+    def remove(self, h: int):
+        node = self.root
+        while node is not None:
+            d = hamming(h, node[0])
+            if d == 0:
+                if node[1] > 0:
+                    node[1] -= 1
+                    if node[1] == 0:
+                        self.dead += 1
+                return
+            node = node[2].get(d)
+
+    def find(self, h: int, radius: int) -> bool:
+        """True if any live hash is within ``radius`` bits of ``h``."""
+        if self.root is None:
+            return False
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            d = hamming(h, node[0])
+            if d <= radius and node[1] > 0:
+                return True
+            for k, child in node[2].items():
+                if d - radius <= k <= d + radius:
+                    stack.append(child)
+        return False
+
+
+class HashIndex:
+    """Near-duplicate index over the last ``max_entries`` hashes added, none
+    older than ``max_age`` seconds. Oldest entries are evicted first."""
+
+    def __init__(self, max_entries: int, max_age: float, distance: int, entries=()):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.distance = distance
+        self.window = deque()
+        self.tree = BKTree()
+        for h, ts in entries:
+            self.window.append((h, ts))
+            self.tree.add(h)
+        self._evict(None)
+
+    def __len__(self):
+        return len(self.window)
+
+    def is_duplicate(self, h: int, now: float) -> bool:
+        self._evict(now)
+        return self.tree.find(h, self.distance)
+
+    def add(self, h: int, now: float):
+        self.window.append((h, now))
+        self.tree.add(h)
+        self._evict(now)
+
+    def dump(self) -> list:
+        return [list(entry) for entry in self.window]
+
+    def _evict(self, now):
+        cutoff = None if now is None else now - self.max_age
+        while self.window and (
+            len(self.window) > self.max_entries
+            or (cutoff is not None and self.window[0][1] < cutoff)
+        ):
+            h, _ = self.window.popleft()
+            self.tree.remove(h)
+
+        if self.tree.dead > len(self.window):
+            self.tree = BKTree(h for h, _ in self.window)
@@ -0,0 +1,163 @@
+import asyncio
+import re
+import traceback
+
+from utils.prefix_store import DEFAULT_PREFIX
+
+LINK_REGEX = re.compile(r"https?://", re.IGNORECASE)
+# The invoked name as discord.py reads it (StringView.get_word): everything
+# up to the first whitespace, with nothing skipped after the prefix.
+COMMAND_TOKEN = re.compile(r"\S*")
+
+
+class ParsedMessage:
+    """Everything the router worked out about a message, computed once."""
+
+    __slots__ = (
+        "message",
+        "prefix",
+        "is_command",
+        "mention_ids",
+        "has_attachments",
+        "has_link",
+    )
+
+    def __init__(self, message, prefix, is_command, mention_ids, has_attachments, has_link):
+        self.message = message
+        self.prefix = prefix
+        self.is_command = is_command
+        self.mention_ids = mention_ids
+        self.has_attachments = has_attachments
+        self.has_link = has_link
+
+
+class Handler:
+    """A registered callback plus the filters that decide when it runs.
+
+    ``channels``, ``guilds`` and ``authors`` are held by reference, so a cog
+    can pass its own live set (or dict) and keep it up to date without
+    re-registering. ``check`` is an optional synchronous predicate run last,
+    for filters that don't fit the others.
+    """
+
+    __slots__ = ("callback", "channels", "guilds", "authors", "mentions", "commands", "dms", "check")
+
+    def __init__(self, callback, channels, guilds, authors, mentions, commands, dms, check):
+        self.callback = callback
+        self.channels = channels
+        self.guilds = guilds
+        self.authors = authors
+        self.mentions = mentions
+        self.commands = commands
+        self.dms = dms
+        self.check = check
+
+    def wants(self, parsed: ParsedMessage) -> bool:
+        message = parsed.message
+
+        if parsed.is_command and not self.commands:
+            return False
+
+        guild = message.guild
+        if guild is None:
+            if not self.dms:
+                return False
+        elif self.guilds is not None and guild.id not in self.guilds:
+            return False
+
+        if self.channels is not None and message.channel.id not in self.channels:
+            return False
+
+        if self.mentions and not parsed.mention_ids:
+            return False
+
+        if self.authors is not None and message.author.id not in self.authors:
+            return False
+
+        if self.check is not None:
+            return self.check(parsed)
+
+        return True
+
+
+class MessageRouter:
+    """Single on_message entry point for the bot.
+
+    Bot messages are dropped up front, the prefix is matched once, commands
+    are invoked directly and the message is only handed to handlers whose
+    filters match it.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.handlers: list[Handler] = []
+
+    def register(
+        self,
+        callback,
+        *,
+        channels=None,
+        guilds=None,
+        authors=None,
+        mentions: bool = False,
+        commands: bool = False,
+        dms: bool = False,
+        check=None,
+    ) -> Handler:
+        handler = Handler(callback, channels, guilds, authors, mentions, commands, dms, check)
+        self.handlers.append(handler)
+        return handler
+
+    def unregister(self, handler: Handler):
+        try:
+            self.handlers.remove(handler)
+        except ValueError:
+            pass
+
+    def parse(self, message) -> ParsedMessage:
+        content = message.content
+
+        if message.guild is None:
+            prefix = DEFAULT_PREFIX
+        else:
+            prefix = self.bot.prefixes.get(message.guild.id)
+
+        is_command = False
+        if content.startswith(prefix):
+            token = COMMAND_TOKEN.match(content, len(prefix)).group()
+            is_command = bool(token) and token in self.bot.all_commands
+
+        mentions = message.mentions
+        mention_ids = frozenset(m.id for m in mentions) if mentions else frozenset()
+
+        return ParsedMessage(
+            message,
+            prefix,
+            is_command,
+            mention_ids,
+            bool(message.attachments),
+            LINK_REGEX.search(content) is not None,
+        )
+
+    async def dispatch(self, message):
+        if message.author.bot:
+            return
+
+        parsed = self.parse(message)
+
+        jobs = [self._run(h, parsed) for h in self.handlers if h.wants(parsed)]
+        if parsed.is_command:
+            jobs.append(self._invoke(message))
+
+        if jobs:
+            await asyncio.gather(*jobs)
+
+    async def _invoke(self, message):
+        ctx = await self.bot.get_context(message)
+        await self.bot.invoke(ctx)
+
+    async def _run(self, handler: Handler, parsed: ParsedMessage):
+        try:
+            await handler.callback(parsed)
+        except Exception:
+            traceback.print_exc()
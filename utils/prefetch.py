@@ -0,0 +1,136 @@
+import asyncio
+import random
+from collections import deque
+
+DEFAULT_SIZE = 5
+DEFAULT_RECENT = 100
+DEFAULT_WAIT = 10
+MIN_BACKOFF = 1
+MAX_BACKOFF = 60
+
+
+class PrefetchBuffer:
+    """Small buffer of ready records kept topped up by a background producer.
+
+    ``fetch`` is an async callable returning a list of records (an empty list
+    or None counts as a failure). ``key`` maps a record to the value used to
+    dedupe it, usually its image URL. Records already buffered or shown in
+    the last ``recent`` pops are dropped on arrival.
+
+    Nothing is fetched until ``warm()`` or the first ``get()``. After that,
+    every pop schedules a refill back up to ``size``, and failing sources
+    are retried with jittered exponential backoff.
+    """
+
+    def __init__(self, fetch, *, key=None, size: int = DEFAULT_SIZE, recent: int = DEFAULT_RECENT):
+        self.fetch = fetch
+        self.key = key or (lambda record: record)
+        self.size = size
+
+        self.items = deque()
+        self.buffered = set()
+        self.recent = deque(maxlen=recent)
+        self.recent_keys = set()
+
+        self.ready = asyncio.Event()
+        self.task = None
+
+        self.fetches = 0
+        self.failures = 0
+
+    def warm(self):
+        if len(self.items) >= self.size:
+            return
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._fill())
+
+    async def get(self, timeout: float = DEFAULT_WAIT):
+        """Pop the next record, waiting up to ``timeout`` seconds if the
+        buffer is empty. Returns None if nothing arrived in time."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while not self.items:
+            self.warm()
+            self.ready.clear()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self.ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+        return self._pop()
+
+    def get_nowait(self):
+        """Pop the next record without waiting; None if the buffer is empty.
+        A refill is started either way."""
+        if not self.items:
+            self.warm()
+            return None
+        return self._pop()
+
+    def seen(self) -> list:
+        """Keys in the recent window, oldest first (for persisting it)."""
+        return list(self.recent)
+
+    def mark_seen(self, keys):
+        for key in keys:
+            if key not in self.recent_keys:
+                self._remember(key)
+
+    def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def _pop(self):
+        record = self.items.popleft()
+        key = self.key(record)
+        self.buffered.discard(key)
+        self._remember(key)
+        self.warm()
+        return record
+
+    def _remember(self, key):
+        if len(self.recent) == self.recent.maxlen:
+            self.recent_keys.discard(self.recent[0])
+        self.recent.append(key)
+        self.recent_keys.add(key)
+
+    def _push(self, records) -> int:
+        added = 0
+        for record in records:
+            key = self.key(record)
+            if key is None or key in self.buffered or key in self.recent_keys:
+                continue
+            self.items.append(record)
+            self.buffered.add(key)
+            added += 1
+        if added:
+            self.ready.set()
+        return added
+
+    async def _fill(self):
+        failures = 0
+        while len(self.items) < self.size:
+            self.fetches += 1
+            try:
+                records = await self.fetch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Prefetch error: {e!r}")
+                records = None
+
+            if records and self._push(records):
+                failures = 0
+                continue
+
+            # nothing new: a dead source and a source that only repeats
+            # itself are both worth backing off from
+            failures += 1
+            self.failures += 1
+            delay = min(MAX_BACKOFF, MIN_BACKOFF * 2 ** (failures - 1))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
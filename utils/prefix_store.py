@@ -0,0 +1,65 @@
+import asyncio
+import json
+import os
+import tempfile
+
+DEFAULT_PREFIX = ","
+
+
+class PrefixStore:
+    """Guild prefixes held in memory and written through to a JSON file."""
+
+    def __init__(self, path: str, default: str = DEFAULT_PREFIX):
+        self.path = path
+        self.default = default
+        self.prefixes: dict[int, str] = {}
+        self.write_lock = asyncio.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            self.prefixes = {}
+            self._write({})
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        self.prefixes = {int(k): v for k, v in data.items()}
+
+    def get(self, guild_id: int) -> str:
+        return self.prefixes.get(guild_id, self.default)
+
+    async def set(self, guild_id: int, prefix: str):
+        self.prefixes[guild_id] = prefix
+        await self.save()
+
+    async def remove(self, guild_id: int) -> bool:
+        if self.prefixes.pop(guild_id, None) is None:
+            return False
+        await self.save()
+        return True
+
+    async def save(self):
+        snapshot = {str(k): v for k, v in self.prefixes.items()}
+        async with self.write_lock:
+            await asyncio.to_thread(self._write, snapshot)
+
+    def _write(self, data: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".prefixes-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise